@@ -46,3 +46,13 @@ tseries = md.timeseries((2,sel), props=("dimensions", "time"))  # tseries gets '
                                                                 #  tseries.coords is a tuple of two elements: the coordinates
                                                                 #  array of the atoms in the third chosen index group, and that
                                                                 #  of the atoms in the 'sel' AtomGroup selection.
+
+tseries = md.timeseries(dtype=numpy.int16)  # coordinates are stored as fixed-point int16 values, taking half the memory;
+                                            #  tseries.coords still gives float32 values, dequantized as they are indexed
+                                            #  (numpy.asarray(tseries.coords) for the whole array).
+
+tseries = md.timeseries(compute={"center": ("cog", 0), "res_centers": ("per_residue_com", "name PO4")})
+                                # Only the reduced quantities are stored: tseries.center is the array (frames, xyz)
+                                #  of the center of geometry of the first chosen index group; tseries.res_centers is
+                                #  the array (frames, residues, xyz) of the centers of mass of each lipid's PO4 bead.
+                                #  tseries.coords is not set.
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import mdreader
+import numpy
+import time
+"""
+Benchmarks serial coordinate extraction with MDreader.timeseries() against
+the naive per-frame approach of slicing an AtomGroup's positions, for a few
+kinds of atom selections and coordinate subsets.
+Both are timed over the same frames, after a warm-up pass so that file
+caching doesn't favor either. Results are reported as frames per second.
+"""
+
+md = mdreader.MDreader()
+md.add_argument("-reps", dest="reps", type=int, default=3,
+                help="Number of timing repetitions (the best is reported)")
+
+md.do_parse()
+natoms = md.atoms.n_atoms
+selections = [("all atoms", md.atoms),
+              ("first half", md.atoms[:natoms//2]),
+              ("every other atom", md.atoms[::2]),
+              ("random tenth", md.atoms[numpy.sort(numpy.random.default_rng(0)
+                                 .choice(natoms, natoms//10, replace=False))])]
+
+def naive(atgrp, cols):
+    md.set_parallel_parms(1)
+    ndx = numpy.unique(atgrp.indices)
+    cdx = numpy.empty((len(md), len(ndx), len(cols)), dtype=numpy.float32)
+    for fm in md.iterate():
+        cdx[md.iterframe] = md.atoms[ndx].positions[:, cols]
+    return cdx
+
+def planned(atgrp, cols):
+    md.set_parallel_parms(1)
+    xyz = [i in cols for i in range(3)]
+    return md.timeseries(atgrp, x=xyz[0], y=xyz[1], z=xyz[2]).coords
+
+def best_fps(fn, *args):
+    times = []
+    for i in range(md.opts.reps):
+        start = time.time()
+        fn(*args)
+        times.append(time.time() - start)
+    return len(md)/min(times)
+
+planned(md.atoms, [0, 1, 2])   # Warm-up
+print("%-18s %-5s %12s %12s %8s" % ("Selection", "Cols", "naive fps",
+                                     "planned fps", "speedup"))
+for name, atgrp in selections:
+    for cols in ([0, 1, 2], [2], [0, 2]):
+        assert numpy.array_equal(naive(atgrp, cols), planned(atgrp, cols))
+        naive_fps = best_fps(naive, atgrp, cols)
+        planned_fps = best_fps(planned, atgrp, cols)
+        print("%-18s %-5s %12.1f %12.1f %7.2fx"
+              % (name, "".join("xyz"[i] for i in cols), naive_fps,
+                 planned_fps, planned_fps/naive_fps))
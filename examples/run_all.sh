@@ -9,5 +9,6 @@ echo 3 4 | python3 AngleWithZ-ndxgroups.py -s start.gro -n index.ndx
 echo 3 4 | python3 AngleWithZ-ndxgroupsParallel.py -s start.gro -n index.ndx
 echo 3 4 | python3 AngleWithZ-ndxgroupsParallel_noargparse.py -s start.gro
 echo 1 2 3 | python3 CoordinatePropExtraction.py -s start.gro 
+python3 ExtractionBenchmark.py -s start.gro
 
 rm -f dens.png dens.eps data.xvg
@@ -15,6 +15,12 @@ The global variable raise_exceptions (default False) controls whether mdreader
 should handle end-user errors on its own by exiting cleanly and replacing a
 traceback by a neater error message, or instead simply raise the exception and
 let the user script catch it.
+
+MPI parallelization, used when running under mpirun/mpiexec, requires the
+optional mpi4py package, which is only imported then. Arrays are gathered
+across ranks as raw buffers, through mpi4py's buffer interface. Install
+mpi4py against your MPI library (for example with 'pip install mpi4py');
+it isn't needed for serial or SMP runs.
 """
 
 # TODO: account for cases where frames have no time (a GRO trajectory, for example).
@@ -33,6 +39,18 @@ import datetime
 import types
 import multiprocessing
 import textwrap
+import pickle
+import copy
+import threading
+import traceback
+import tempfile
+import hashlib
+import struct
+import io
+import errno
+import shutil
+import marshal
+import importlib
 
 
 # Globals ##############################################################
@@ -41,6 +59,19 @@ import textwrap
 #  exceptions to reach the calling code.
 INF = float('inf')
 raise_exceptions = False
+# Largest MPI message, in bytes, before falling back to chunked transfers.
+_mpi_max_bytes = 2**31 - 1
+# Whether to keep on-disk indices of trajectory frame offsets and times, to
+#  be reused by parallel workers and later runs. Frame offsets of formats for
+#  which MDAnalysis keeps its own offset cache (XTC/TRR) are left to it.
+offset_index = True
+# How much larger than an even share a block may get when aligning blocks to
+#  trajectory file boundaries.
+_align_slack = 0.1
+# Room left, beyond the first frame's extent, for coordinates stored as
+#  fixed-point integers with the default scale (molecules drifting out of
+#  the box, a growing box).
+_scale_margin = 0.25
 _default_opts = {'s'    : 'topol.tpr',
                  'f'    : 'traj.xtc',
                  'o'    : 'data.xvg',
@@ -50,6 +81,17 @@ _default_opts = {'s'    : 'topol.tpr',
                  'np'   : 0,
                  'v'    : 1}
 
+# Reader attributes that may change between parallel calls, and that must be
+#  passed on to persistent pool workers.
+_p_state_attrs = ('opts', 'prefetch', 'p_fn', 'p_args', 'p_kwargs', 'p_mode',
+                  'p_overlap', 'p_align_files', 'p_time_blocks',
+                  'p_chunk', 'p_reduce', '_p_out', 'p_num', 'p_scale_dt',
+                  'parallel', 'p_smp', 'p_mpi', 'progress', 'outstats',
+                  'statavg', 'hastime', '_tseries', '_startframe', '_endframe',
+                  '_totalframes', '_row_offset')
+# Those of them that only per-frame function calls need.
+_p_fn_attrs = ('p_fn', 'p_args', 'p_kwargs', 'p_reduce')
+
 # Helper functions and decorators ######################################
 ########################################################################
 
@@ -122,21 +164,481 @@ def _parallel_extractor(rdr, w_id):
     """ Helper function for parallel-extracting trajectory coordinates/values.
 
     """
-    # block seems to be faster.
-    rdr.p_mode = 'block'
+    # block seems to be faster, unless the user explicitly wants dynamic
+    # load balancing. Overlapping frames would be extracted twice.
+    if rdr.p_mode != 'dynamic':
+        rdr.p_mode = 'block'
+    rdr.p_overlap = 0
     rdr.p_id = w_id
     return rdr._extractor()
 
+def _parallel_stream_launcher(rdr, chunk_id):
+    """ Helper function for streaming registered functions' results.
+
+    Frames are always split in small, ordered chunks, as in 'dynamic' mode.
+    """
+    rdr.p_mode = 'dynamic'
+    return _parallel_launcher(rdr, chunk_id)
+
+def _parallel_chunk_launcher(rdr, chunk_id):
+    """ Helper function for executing registered functions on a frame chunk.
+
+    Also returns the id of the worker process, which can pick up several
+    chunks.
+    """
+    return os.getpid(), _parallel_launcher(rdr, chunk_id)
+
+def _parallel_chunk_extractor(rdr, chunk_id):
+    """ Helper function for extracting the timeseries of a frame chunk.
+
+    Returns the extracted arrays in a dict, keyed as the Timeseries attributes.
+    """
+    rdr.p_mode = 'dynamic'
+    rdr.p_overlap = 0
+    rdr.p_id = chunk_id
+    tseries = rdr._extractor()
+    return dict((key, getattr(tseries, key))
+                for key, shape, dtype in rdr._tseries_specs(0))
+
+def _merge_partials(partials, reduce_init, reduce_fn):
+    """ Merges, in order, reduction partials from _reader.
+
+    Each element of 'partials' is either empty (an idle worker) or a
+    1-element list holding a worker's partial result. reduce_init is returned
+    if there are no partials at all.
+    """
+    ret = []
+    for partial in partials:
+        if partial:
+            ret = [reduce_fn(ret[0], partial[0])] if ret else list(partial)
+    return ret[0] if ret else copy.deepcopy(reduce_init)
+
+def _mpi_tree_reduce(comm, partial, reduce_fn, root=0):
+    """ Binary-tree merge of _reader partials across MPI ranks.
+
+    Lower ranks (earlier frames, in block mode) are always merged on the
+    left. Returns the merged partial on the root, None elsewhere.
+    """
+    rank = (comm.Get_rank() - root) % comm.Get_size()
+    size = comm.Get_size()
+    step = 1
+    while step < size:
+        if rank % (2 * step):
+            comm.send(partial, dest=(rank - step + root) % size, tag=77)
+            return None
+        if rank + step < size:
+            other = comm.recv(source=(rank + step + root) % size, tag=77)
+            if partial and other:
+                partial = [reduce_fn(partial[0], other[0])]
+            elif other:
+                partial = other
+        step *= 2
+    return partial
+
+def _mpi_gatherv(comm, sendarr, recvarr, counts, root=0):
+    """ Gathers arrays, stacked along their first axis in rank order.
+
+    'counts' lists how many rows each rank sends. The data travel as raw
+    bytes into the preallocated 'recvarr' on the root (None elsewhere),
+    which is returned. Messages too large for MPI's int counts are sent
+    rank by rank, in chunks. Object arrays fall back to pickled gathering.
+    """
+    from mpi4py import MPI
+    rank = comm.Get_rank()
+    sendarr = np.ascontiguousarray(sendarr)
+    if sendarr.dtype.hasobject:
+        parts = comm.gather(sendarr, root=root)
+        if rank == root:
+            recvarr[...] = np.concatenate(parts)
+        return recvarr
+    rowbytes = sendarr.dtype.itemsize * int(np.prod(sendarr.shape[1:],
+                                                    dtype=np.int64))
+    bcounts = np.asarray(counts, dtype=np.int64) * rowbytes
+    if bcounts.sum() <= _mpi_max_bytes:
+        recvbuf = None
+        if rank == root:
+            displs = np.concatenate(([0], np.cumsum(bcounts)[:-1]))
+            recvbuf = [recvarr.reshape(-1).view(np.uint8),
+                       (bcounts.tolist(), displs.tolist()), MPI.BYTE]
+        comm.Gatherv([sendarr.reshape(-1).view(np.uint8), MPI.BYTE], recvbuf,
+                     root=root)
+        return recvarr
+    # Chunked fallback, with point-to-point messages.
+    maxrows = max(1, _mpi_max_bytes // max(1, rowbytes))
+    if rank == root:
+        offset = 0
+        for src, nrows in enumerate(counts):
+            if src == root:
+                recvarr[offset:offset+nrows] = sendarr
+            else:
+                for start in range(offset, offset+nrows, maxrows):
+                    chunk = recvarr[start:min(start+maxrows, offset+nrows)]
+                    comm.Recv([chunk.reshape(-1).view(np.uint8), MPI.BYTE],
+                              source=src, tag=78)
+            offset += nrows
+    else:
+        for start in range(0, len(sendarr), maxrows):
+            chunk = sendarr[start:start+maxrows]
+            comm.Send([chunk.reshape(-1).view(np.uint8), MPI.BYTE], dest=root,
+                      tag=78)
+    return recvarr
+
+def _set_shared_attrs(tseries):
+    """ Sets as tseries attributes the arrays of its _shared container. """
+    for attr, arr in tseries._shared.arrays().items():
+        setattr(tseries, attr, arr)
+
 def concat_tseries(lst, ret=None):
     """ Concatenates a list of Timeseries objects """
     if ret is None:
         ret = lst[0]
     if len(lst[0]._tjcdx_ndx):
         ret._cdx = np.concatenate([i._cdx for i in lst])
-    for attr in ret._props:
+    for attr in ret._props + [name for name, reduction in ret._compute]:
         setattr(ret, attr, np.concatenate([getattr(i, attr) for i in lst]))
     return ret
 
+def _npy_append(fname, arr):
+    """Appends the rows of arr to the array stored in .npy file fname.
+
+    The file's header is rewritten in place with the new shape, after the
+    data is appended, so that the file stays readable throughout. Should
+    the new header not fit in the old one's space, the file is rewritten.
+    """
+    with open(fname, 'rb') as npyfile:
+        version = np.lib.format.read_magic(npyfile)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(
+                                                                    npyfile)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(
+                                                                    npyfile)
+        datastart = npyfile.tell()
+    arr = np.ascontiguousarray(arr, dtype=dtype)
+    if fortran or arr.shape[1:] != shape[1:]:
+        raise ValueError("Can't append an array of shape %r to that of shape "
+                         "%r in %s." % (arr.shape, shape, fname))
+    newshape = (shape[0] + len(arr),) + shape[1:]
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype),
+                   'fortran_order': False,
+                   'shape': newshape}).encode('latin1')
+    # Magic string, version, and header length (2 bytes long in v1.0).
+    prefix = 8 + (2 if version == (1, 0) else 4)
+    space = datastart - prefix - 1
+    if len(header) > space:
+        old = np.load(fname, mmap_mode='r')
+        fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(fname) or '.',
+                                       suffix='.npy')
+        os.close(fd)
+        new = np.lib.format.open_memmap(tmpname, mode='w+', dtype=dtype,
+                                        shape=newshape)
+        new[:len(old)] = old
+        new[len(old):] = arr
+        new.flush()
+        del new, old
+        shutil.copymode(fname, tmpname)
+        os.rename(tmpname, fname)
+        return
+    with open(fname, 'r+b') as npyfile:
+        npyfile.seek(datastart + int(np.prod(shape)) * dtype.itemsize)
+        npyfile.write(arr.tobytes())
+        npyfile.truncate()
+        npyfile.seek(prefix)
+        npyfile.write(header + b' ' * (space - len(header)) + b'\n')
+
+def _free_space(dirname):
+    """Bytes free for us under dirname (inf if it can't be told)."""
+    try:
+        stat = os.statvfs(dirname)
+    except (AttributeError, OSError):
+        return INF
+    return stat.f_bavail * stat.f_frsize
+
+def _shared_tmpdir(size=0):
+    """Where to put the files backing arrays shared between processes.
+
+    'size' is the number of bytes that must fit there.
+    """
+    # A RAM-backed filesystem, if available, spares us actual disk IO. It
+    #  is often much smaller than RAM, though, and running out of it while
+    #  writing to a mapped file gets workers killed with a SIGBUS.
+    if (os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) and
+            _free_space('/dev/shm') >= size):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+def _offsets_filename(fname):
+    """Where the frame-offset index of trajectory fname is kept."""
+    fname = os.path.abspath(fname)
+    dirname, base = os.path.split(fname)
+    idxname = os.path.join(dirname, '.%s.mdreader_offsets.npz' % base)
+    if os.path.exists(idxname) or os.access(dirname, os.W_OK):
+        return idxname
+    # Read-only trajectory dir: index under the temp dir, by full path.
+    digest = hashlib.md5(fname.encode('utf-8')).hexdigest()
+    return os.path.join(tempfile.gettempdir(), 'mdreader_offsets',
+                        '%s.%s.npz' % (base, digest))
+
+def _offsets_key(fname):
+    """What a stored index must match to be valid for trajectory fname."""
+    stat = os.stat(fname)
+    return os.path.abspath(fname), stat.st_size, stat.st_mtime
+
+def _load_offset_index(fname, key='offsets'):
+    """Returns the stored frame offsets (or times) of trajectory fname.
+
+    Returns None if there's no index or if it's stale, that is, if the
+    trajectory's path, size or modification time have since changed.
+    'key' can be set to 'times' to get the frame times instead, if
+    they've been stored.
+    """
+    try:
+        with np.load(_offsets_filename(fname)) as data:
+            filekey = (str(data['path']), int(data['size']),
+                       float(data['mtime']))
+            if filekey != _offsets_key(fname):
+                return None
+            return data[key]
+    except (IOError, OSError, KeyError, ValueError):
+        return None
+
+def _save_offset_index(fname, offsets, times=None):
+    """Stores the frame offsets (and times) of trajectory fname."""
+    arrays = {'offsets': np.asarray(offsets)}
+    if times is not None:
+        arrays['times'] = np.asarray(times)
+    idxname = _offsets_filename(fname)
+    path, size, mtime = _offsets_key(fname)
+    try:
+        dirname = os.path.dirname(idxname)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        # Written aside and then renamed, so that concurrent readers never
+        #  see a partial index.
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.npz')
+        with os.fdopen(fd, 'wb') as idxfile:
+            np.savez(idxfile, path=path, size=size, mtime=mtime, **arrays)
+        _umask_chmod(tmpname)
+        os.rename(tmpname, idxname)
+    except (IOError, OSError):
+        # The index is just a shortcut. Not being able to keep it is no error.
+        pass
+
+def _umask_chmod(fname):
+    """Gives a mkstemp file the permissions a plain new file would get.
+
+    mkstemp files are only accessible to their owner, which won't do for
+    files shared with others, such as indices in a project directory.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(fname, 0o666 & ~umask)
+
+def _keeps_own_offsets(rdr):
+    """Whether a per-file reader keeps its own on-disk offset cache.
+
+    Current MDAnalysis XTC/TRR readers load their offsets from it (or
+    index the file, and store them) as soon as they're opened.
+    """
+    return hasattr(rdr, "_xdr") and hasattr(rdr, "_load_offsets")
+
+def _offsets_stored(fname):
+    """Whether the frame offsets of trajectory fname are already on disk.
+
+    That is, in MDAnalysis' own offset cache, or in our index for older
+    MDAnalysis versions, which don't keep one.
+    """
+    try:
+        from MDAnalysis.coordinates.XDR import offsets_filename
+    except ImportError:
+        return _load_offset_index(fname) is not None
+    try:
+        with np.load(offsets_filename(fname)) as data:
+            return (float(data['ctime']) == os.path.getctime(fname) and
+                    int(data['size']) == os.path.getsize(fname))
+    except (IOError, OSError, KeyError, ValueError):
+        return False
+
+def _traj_subreaders(traj):
+    """The per-file readers of a trajectory (several, for the ChainReader).
+    """
+    if traj.format == "CHAIN":
+        return list(traj.readers)
+    return [traj]
+
+def _reader_offsets(rdr):
+    """Returns the frame offsets of a per-file reader, indexing it if needed.
+
+    Returns None for formats that don't index frames.
+    """
+    if hasattr(rdr, "_xdr"):
+        # XTC/TRR readers
+        if not len(rdr._xdr.offsets):
+            len(rdr)
+        return np.asarray(rdr._xdr.offsets)
+    if hasattr(rdr, "_TrjReader__offsets"):
+        # Older MDAnalysis XTC/TRR readers, which index lazily.
+        if rdr._TrjReader__offsets is None:
+            len(rdr)
+        return np.asarray(rdr._TrjReader__offsets)
+    return None
+
+def _set_reader_offsets(rdr, offsets):
+    """Sets already known frame offsets on a per-file reader."""
+    if offsets is None:
+        return
+    if hasattr(rdr, "_xdr"):
+        rdr._xdr.set_offsets(offsets)
+    elif hasattr(rdr, "_TrjReader__offsets"):
+        rdr._TrjReader__offsets = offsets
+        rdr._TrjReader__numframes = len(offsets)
+
+def _index_trajfile(fname):
+    """Indexes the frames of a trajectory file, storing the index.
+
+    Returns the frame offsets, or None if the format doesn't index frames.
+    Opening the file is enough for current MDAnalysis versions to keep
+    their own offset cache, which makes loading the file later on much
+    faster; ours is then not needed.
+    """
+    try:
+        rdr = mda.coordinates.core.get_reader_for(fname)(fname)
+    except Exception:
+        # Formats that need more than a file name to be read (such as the
+        #  number of atoms) are left for MDAnalysis to index when loading.
+        return None
+    try:
+        offsets = _reader_offsets(rdr)
+        own_cache = _keeps_own_offsets(rdr)
+    finally:
+        rdr.close()
+    if offset_index and offsets is not None and not own_cache:
+        _save_offset_index(fname, offsets)
+    return offsets
+
+def _trr_header_time(trrfile, offset):
+    """Reads the time from the header of the TRR frame at offset."""
+    # The header is the magic number, the version string (two lengths and
+    #  12 characters), then 13 sizes and counts, and then the time, in
+    #  single or double precision as the frame's reals.
+    trrfile.seek(offset + 24)
+    (ir_size, e_size, box_size, vir_size, pres_size, top_size, sym_size,
+     x_size, v_size, f_size, natoms, step, nre) = struct.unpack(
+                                                    '>13i', trrfile.read(52))
+    if box_size:
+        realsize = box_size // 9
+    else:
+        realsize = (x_size or v_size or f_size) // (3 * natoms)
+    if realsize == 8:
+        return struct.unpack('>d', trrfile.read(8))[0]
+    return struct.unpack('>f', trrfile.read(4))[0]
+
+def _reader_times(rdr, offsets=None):
+    """Returns the time of each frame of a per-file reader.
+
+    For XTC and TRR files these are read from the frame headers at each
+    offset, without decoding the frames. Formats whose time is just the
+    frame number times the time step (DCD, or any format not storing times)
+    get it computed. Other formats are read in full, by a copy of the
+    reader.
+    """
+    if rdr.format in ('XTC', 'TRR') and offsets is not None:
+        times = np.empty(len(offsets))
+        with open(rdr.filename, 'rb') as xdrfile:
+            for i, offset in enumerate(offsets):
+                if rdr.format == 'TRR':
+                    times[i] = _trr_header_time(xdrfile, offset)
+                else:
+                    # The frame header is the magic number, the number of
+                    #  atoms, the step, and then the time, as big-endian
+                    #  4-byte words.
+                    xdrfile.seek(offset + 12)
+                    times[i] = struct.unpack('>f', xdrfile.read(4))[0]
+        return times
+    if rdr.format == 'DCD' or 'time' not in rdr.ts.data:
+        return (rdr.ts.time +
+                (np.arange(rdr.n_frames) - rdr.ts.frame) * rdr.ts.dt)
+    rdr = rdr.copy()
+    try:
+        return np.array([ts.time for ts in rdr[:]])
+    finally:
+        rdr.close()
+
+def _continuous_times(times):
+    """Makes frame times non-decreasing by continuing them across resets.
+
+    Wherever time goes back (as when concatenated files each restart at
+    zero) the following times are shifted to resume one frame step
+    after the previous frame; that step is taken from just before the
+    reset, or just after it if there's none.
+    """
+    times = np.array(times, dtype=float)
+    steps = np.diff(times)
+    for i in np.flatnonzero(steps < 0):
+        if i and steps[i-1] > 0:
+            step = steps[i-1]
+        elif i+1 < len(steps) and steps[i+1] > 0:
+            step = steps[i+1]
+        else:
+            step = 0.
+        times[i+1:] += times[i] + step - times[i+1]
+        steps[i] = step
+    return times
+
+def _clone_reader(rdr):
+    """Returns an independent copy of a trajectory reader.
+
+    The copy has its own file handle(s) and position. Per-file readers are
+    recreated from their own class and init arguments (file name, format
+    options and kwargs), which MDAnalysis' Reader.copy() does for any
+    format, and get the original's frame offsets. A ChainReader gets a
+    clone of each of its readers, and in-memory readers share their
+    frame arrays and only get their own Timestep.
+    """
+    if rdr.format == "CHAIN":
+        new = copy.copy(rdr)
+        new.readers = [_clone_reader(sub) for sub in rdr.readers]
+        # Points new.ts to the new active reader's Timestep.
+        new[rdr.ts.frame]
+        return new
+    if rdr.format == "MEMORY":
+        new = copy.copy(rdr)
+        new.ts = rdr.ts.copy()
+        return new
+    try:
+        new = rdr.copy()
+    except (AttributeError, NotImplementedError, TypeError):
+        raise_error(AttributeError,
+                    "Don't know how to get a new file descriptor for "
+                    "the %s trajectory format. You'll have to skip "
+                    "parallelization.\n%r" % (rdr.format, sys.exc_info()[1]))
+    if hasattr(rdr, "_xdr") or hasattr(rdr, "_TrjReader__offsets"):
+        _set_reader_offsets(new, _reader_offsets(rdr))
+    return new
+
+def _traj_offsets(traj):
+    """The frame offsets of each of the trajectory's files."""
+    return [_reader_offsets(rdr) for rdr in _traj_subreaders(traj)]
+
+def _set_traj_offsets(traj, offsets):
+    """Sets frame offsets, as returned by _traj_offsets, on a trajectory."""
+    for rdr, rdr_offsets in zip(_traj_subreaders(traj), offsets):
+        _set_reader_offsets(rdr, rdr_offsets)
+
+# The reader calling per-frame functions in this thread.
+_current = threading.local()
+
+def current_reader():
+    """Returns the MDreader running the per-frame function being called.
+
+    Per-frame functions passed to MDreader.do_in_parallel() or
+    MDreader.iter_parallel() can use it to get at the frame being worked on
+    (as in mdreader.current_reader().trajectory.ts) instead of a global
+    reader, which workers started with the 'spawn' or 'forkserver' methods
+    don't have. In parallel workers this is the worker's own reader.
+    """
+    return getattr(_current, 'reader', None)
+
 def raise_error(exc, msg):
     if raise_exceptions:
         raise exc(msg)
@@ -174,46 +676,570 @@ else:
 # Helper Classes #######################################################
 ########################################################################
 
+class _WorkerFailure():
+    """Stand-in result sent back by a Pool worker whose task raised.
+
+    'stale' flags failures to load the shipped reader state (typically a
+    function that was defined after the worker was forked), which the
+    Pool recovers from by forking fresh workers.
+    """
+    def __init__(self, tb, stale=False):
+        self.tb = tb
+        self.stale = stale
+
+
+def _init_process_worker(rdr):
+    # We need a brand new file descriptor per SMP worker, otherwise we
+    # have a nice chaos.
+    rdr._reopen_traj()
+    return rdr
+
+def _init_thread_worker(rdr):
+    # Threads share the Universe, but each needs its own trajectory reader.
+    rdr._tlocal.trajectory = rdr._clone_traj()
+    return rdr
+
+def _init_spec_worker(spec):
+    # Workers that didn't fork from the parent rebuild their own reader.
+    return spec.build()
+
+def _pool_worker(rdr, inqueue, outqueue, init=_init_process_worker):
+    """ Task loop of a persistent Pool worker.
+
+    Each task is a (num, f, args, gen, payload) tuple; f(rdr, *args) is
+    run and its result put in the outqueue as (num, result). payload, when
+    not None, is a dict of reader attributes to refresh before running f
+    (for process workers, the name of the file the parent pickled it into,
+    once per generation). It is only applied when its generation number
+    changes. A None task stops the worker.
+    """
+    # Being persistent, the worker only initializes once.
+    try:
+        rdr = init(rdr)
+        failure = None
+    except BaseException:
+        failure = _WorkerFailure(traceback.format_exc())
+    cur_gen = None
+    for num, f, args, gen, payload in iter(inqueue.get, None):
+        if failure is not None:
+            outqueue.put((num, failure))
+            continue
+        if payload is not None and gen != cur_gen:
+            try:
+                if isinstance(payload, dict):
+                    rdr.__dict__.update(payload)
+                else:
+                    with open(payload, 'rb') as statefile:
+                        rdr.__dict__.update(_loads_state(statefile.read(),
+                                                         rdr))
+            except Exception:
+                outqueue.put((num, _WorkerFailure(traceback.format_exc(),
+                                                  stale=True)))
+                continue
+            cur_gen = gen
+        rdr.i_parms_set = False
+        try:
+            outqueue.put((num, f(rdr, *args)))
+        except BaseException:
+            outqueue.put((num, _WorkerFailure(traceback.format_exc())))
+
+
+def _code_names(code):
+    """The global names used by code, and by the code nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_code_names(const))
+    return names
+
+def _make_cell(value):
+    return (lambda: value).__closure__[0]
+
+def _rebuild_function(code, modname, name, defaults, kwdefaults, cells,
+                      names, selfref):
+    """Recreates a function shipped by value by _StatePickler."""
+    try:
+        fglobals = dict(vars(importlib.import_module(modname)))
+    except ImportError:
+        fglobals = {'__builtins__': six.moves.builtins}
+    fglobals.update(names)
+    closure = None
+    if cells is not None:
+        closure = tuple(_make_cell(value) for value in cells)
+    fn = types.FunctionType(marshal.loads(code), fglobals, name, defaults,
+                            closure)
+    if kwdefaults:
+        fn.__kwdefaults__ = kwdefaults
+    if selfref:
+        fglobals[name] = fn
+    return fn
+
+
+class _StatePickler(pickle.Pickler):
+    """Pickles reader state for pool workers, the reader's own objects by
+    reference.
+
+    The reader itself, and its AtomGroups, ResidueGroups and SegmentGroups
+    (which can't be pickled, as they'd take the reader along), are sent as
+    just their indices, and rebuilt by _StateUnpickler against the worker's
+    own reader. Functions that workers can't look up by name (lambdas,
+    closures, and functions of the main script defined after the workers
+    were forked) are sent by value: their code, closure, and the main
+    script's globals they use, bar those already 'inherited' (a dict of
+    the main script's globals, as they were when the workers forked).
+    """
+    _levels = (('atoms', mda.core.groups.AtomGroup),
+               ('residues', mda.core.groups.ResidueGroup),
+               ('segments', mda.core.groups.SegmentGroup))
+
+    def __init__(self, fileobj, rdr, inherited=None):
+        pickle.Pickler.__init__(self, fileobj, pickle.HIGHEST_PROTOCOL)
+        self.rdr = rdr
+        self.inherited = inherited or {}
+
+    def persistent_id(self, obj):
+        if obj is self.rdr:
+            return ('reader',)
+        for level, cls in self._levels:
+            if isinstance(obj, cls) and obj.universe is self.rdr:
+                return (level, obj.ix)
+        if isinstance(obj, types.ModuleType):
+            return ('module', obj.__name__)
+        if isinstance(obj, types.FunctionType) and not self._by_name(obj):
+            return self._function_id(obj)
+        return None
+
+    def _by_name(self, fn):
+        """Whether workers can look fn up by its name."""
+        if fn.__module__ == '__main__':
+            return self.inherited.get(fn.__name__) is fn
+        module = sys.modules.get(fn.__module__)
+        found = module
+        for attr in getattr(fn, '__qualname__', fn.__name__).split('.'):
+            found = getattr(found, attr, None)
+        return module is not None and found is fn
+
+    def _function_id(self, fn):
+        code = fn.__code__
+        cells = None
+        if fn.__closure__ is not None:
+            try:
+                cells = tuple(cell.cell_contents for cell in fn.__closure__)
+            except ValueError:
+                raise pickle.PicklingError("Can't ship %r, which has empty "
+                                           "closure cells." % fn)
+        names = {}
+        selfref = False
+        if fn.__module__ == '__main__':
+            # Other modules' globals are there for workers to import.
+            for name in _code_names(code):
+                if name not in fn.__globals__:
+                    continue
+                value = fn.__globals__[name]
+                if value is fn:
+                    selfref = True
+                elif self.inherited.get(name) is not value:
+                    names[name] = value
+        return ('function', marshal.dumps(code), fn.__module__, fn.__name__,
+                fn.__defaults__, getattr(fn, '__kwdefaults__', None), cells,
+                names, selfref)
+
+
+class _StateUnpickler(pickle.Unpickler):
+    """Unpickles what _StatePickler pickled, against reader rdr."""
+    def __init__(self, fileobj, rdr):
+        pickle.Unpickler.__init__(self, fileobj)
+        self.rdr = rdr
+
+    def persistent_load(self, pid):
+        if pid[0] == 'reader':
+            return self.rdr
+        if pid[0] == 'module':
+            return importlib.import_module(pid[1])
+        if pid[0] == 'function':
+            return _rebuild_function(*pid[1:])
+        return getattr(self.rdr, pid[0])[pid[1]]
+
+def _dumps_state(state, rdr, inherited=None):
+    buf = io.BytesIO()
+    _StatePickler(buf, rdr, inherited).dump(state)
+    return buf.getvalue()
+
+def _loads_state(payload, rdr):
+    return _StateUnpickler(io.BytesIO(payload), rdr).load()
+
+
+class _WorkerSpec():
+    """A compact, picklable recipe for rebuilding a reader in a worker.
+
+    Holds only what workers need: the topology and trajectory file names,
+    the parsed options and frame range, the atom indices of the selected
+    index groups, and the iteration/parallelization attributes (which
+    include the timeseries extraction plan). Per-frame functions and their
+    arguments are sent separately, with each parallel call; AtomGroup
+    arguments as their indices, rebuilt against the worker's reader, which
+    functions get with mdreader.current_reader().
+    """
+    _unshipped = _p_fn_attrs
+
+    def __init__(self, rdr):
+        self.topol = rdr.opts.topol
+        self.infile = list(rdr.opts.infile)
+        self.nframes = rdr.nframes
+        # So that workers needn't index the trajectory again.
+        self.offsets = rdr._offsets
+        if rdr.hasindex:
+            self.ndx_indices = [grp.indices for grp in rdr.ndxgs]
+        else:
+            self.ndx_indices = None
+        self.state = dict((attr, val) for attr, val in rdr._p_state().items()
+                          if attr not in self._unshipped)
+
+    def build(self):
+        """Returns a new reader, ready to iterate in a worker."""
+        rdr = SimpleReader(s=self.topol, f=self.infile, v=0)
+        # Workers don't take part in MPI communication.
+        rdr.mpi = False
+        rdr.__dict__.update(self.state)
+        mda.Universe.__init__(rdr, self.topol, *self.infile)
+        if self.offsets is not None:
+            _set_traj_offsets(rdr.trajectory, self.offsets)
+        rdr._nframes = self.nframes
+        rdr._offsets = self.offsets
+        rdr._parsed = True
+        if self.ndx_indices is not None:
+            rdr.hasindex = True
+            rdr.ndxgs = [rdr.atoms[ndx] for ndx in self.ndx_indices]
+        return rdr
+
+
+def _copy_ts(src, dst):
+    """Copies the frame data of Timestep src into the buffers of dst."""
+    dst.frame = src.frame
+    if src.has_positions:
+        dst.positions = src.positions
+    if src.has_velocities:
+        dst.velocities = src.velocities
+    if src.has_forces:
+        dst.forces = src.forces
+    dst.dimensions = src.dimensions
+    dst.data.clear()
+    dst.data.update(src.data)
+
+
+class _Prefetcher():
+    """Decodes upcoming frames in a background thread.
+
+    Frames are read by an independent copy of the trajectory reader, and
+    copied into a ring of preallocated Timesteps, up to 'depth' frames ahead
+    of the one being consumed. Iterating over a _Prefetcher yields those
+    Timesteps in order; each is only reused after the next one is yielded.
+    """
+    def __init__(self, traj, frames, depth, template_ts):
+        self.traj = traj
+        self.frames = frames
+        self.free = six.moves.queue.Queue()
+        for i in range(depth + 1):
+            self.free.put(template_ts.copy())
+        self.filled = six.moves.queue.Queue()
+        self.exc_info = None
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def _run(self):
+        try:
+            for ts in self.traj[self.frames]:
+                slot = self.free.get()
+                if slot is None:
+                    # The consumer is gone.
+                    break
+                _copy_ts(ts, slot)
+                self.filled.put(slot)
+        except Exception:
+            self.exc_info = sys.exc_info()
+        finally:
+            self.filled.put(None)
+
+    def __iter__(self):
+        self.thread.start()
+        current = None
+        try:
+            while True:
+                slot = self.filled.get()
+                if current is not None:
+                    self.free.put(current)
+                if slot is None:
+                    break
+                current = slot
+                yield slot
+            if self.exc_info is not None:
+                six.reraise(*self.exc_info)
+        finally:
+            self.free.put(None)
+            self.thread.join()
+            self.traj.close()
+
+
 class Pool():
-    # MDA and multiprocessing's map don't play along because of pickling.
-    #  This solution seems to work fine.
-    def __init__(self, processes):
+    """A persistent pool of forked workers, each holding a copy of a reader.
+
+    MDA and multiprocessing's map don't play along because of pickling, so
+    workers get the reader by fork inheritance instead. They are kept alive
+    between map calls, together with their Universe and open trajectory
+    file descriptors. Reader attributes that may have changed since the
+    fork are shipped once per map call, through a file that workers read
+    when they first get a task of that call. AtomGroups of the reader go
+    as just their indices, and lambdas and other functions workers can't
+    look up by name as their code (see _StatePickler). When state still
+    can't be shipped the workers are re-forked, with a warning, as that
+    costs as much as a non-persistent pool.
+
+    Under non-fork multiprocessing start methods workers instead rebuild a
+    lightweight reader from a _WorkerSpec, and per-frame functions, with
+    whatever they use, must be picklable as described above. They reach
+    the worker's reader through the reader's AtomGroups they use, or
+    mdreader.current_reader().
+    """
+    def __init__(self, processes, rdr=None):
         self.nprocs = processes
+        self.rdr = rdr
+        self.procs = []
+        self._gen = 0
+        self._statefile = None
+        self._warned = False
 
-    def map(self, f, argtuple):
-        procs = []
-        nargs = len(argtuple)
-        result = [None]*nargs
-        arglist = list(argtuple)
+    @property
+    def alive(self):
+        return bool(self.procs) and all(proc.is_alive()
+                                        for proc in self.procs)
+
+    @property
+    def inherits(self):
+        """Whether workers are forked, and so inherit the reader for free."""
+        return multiprocessing.get_start_method() == 'fork'
+
+    def start(self):
+        self.inqueue = multiprocessing.Queue()
         self.outqueue = multiprocessing.Queue()
-        freeprocs = self.nprocs
-        num = 0
-        got = 0
-        while arglist:
-            while arglist and freeprocs:
-                procs.append(multiprocessing.Process(target=self.fcaller,
-                                                     args=((f, arglist.pop(0),
-                                                            num))))
-                num += 1
-                freeprocs -= 1
-                # procs[-1].daemon = True
-                procs[-1].start()
-            # Execution halts here waiting for output after filling the procs.
-            i, r = self.outqueue.get()
-            result[i] = r
-            got += 1
-            freeprocs += 1
-        # Must wait for remaining procs, otherwise we'll miss their output.
-        while got < nargs:
-            i, r = self.outqueue.get()
-            result[i] = r
-            got += 1
-        for proc in procs:
-            proc.terminate()
+        if self.inherits:
+            args = (self.rdr, self.inqueue, self.outqueue)
+        else:
+            # Under 'spawn' or 'forkserver' the reader would have to be
+            #  pickled whole, Universe and all. Send a compact recipe instead.
+            args = (self.rdr._worker_spec(), self.inqueue, self.outqueue,
+                    _init_spec_worker)
+        self.procs = [multiprocessing.Process(target=_pool_worker, args=args)
+                      for i in range(self.nprocs)]
+        for proc in self.procs:
+            proc.daemon = True
+            proc.start()
+        # Fresh forked workers have just inherited the current reader state,
+        #  and the main script's globals.
+        self._fresh = self.inherits
+        self._inherited = {}
+        if self.inherits and '__main__' in sys.modules:
+            self._inherited = dict(vars(sys.modules['__main__']))
+
+    def close(self):
+        self._drop_statefile()
+        if not self.procs:
+            return
+        for proc in self.procs:
+            if proc.is_alive():
+                self.inqueue.put(None)
+        for proc in self.procs:
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+        self.procs = []
+
+    def restart(self):
+        self.close()
+        self.start()
+
+    def _lose_persistence(self, why):
+        """Re-forks the workers, warning the first time."""
+        if not self._warned:
+            self._warned = True
+            sys.stderr.write("Warning: restarting the parallel workers, as %s."
+                             " Workers then reopen the trajectory on every "
+                             "such call.\n" % why)
+        self.restart()
+
+    def _drop_statefile(self):
+        if self._statefile is not None:
+            if os.path.exists(self._statefile):
+                os.remove(self._statefile)
+            self._statefile = None
+
+    def map(self, f, argtuple, state=None, callback=None):
+        """Runs f(rdr, *args) on the workers for each args in argtuple.
+
+        'state' is an optional dict of reader attributes to update in the
+        workers before running f. 'callback', if given, is called with the
+        number of tasks done so far every time one finishes. Returns the
+        list of results, in order.
+        """
+        payload = self._prepare(state)
+        arglist = list(argtuple)
+        for num, args in enumerate(arglist):
+            self.inqueue.put((num, f, args, self._gen, payload))
+        result = [None]*len(arglist)
+        failures = []
+        try:
+            for r_num in range(len(arglist)):
+                num, r = self._get()
+                if isinstance(r, _WorkerFailure):
+                    failures.append(r)
+                result[num] = r
+                if callback is not None:
+                    callback(r_num + 1)
+        finally:
+            # All tasks that needed the state are done.
+            self._drop_statefile()
+        if failures:
+            if payload is not None and all(fail.stale for fail in failures):
+                # Workers can't see objects created after they were forked.
+                self._lose_persistence("their state references objects "
+                                       "they can't see:\n%s"
+                                       % failures[0].tb.strip())
+                return self.map(f, arglist, state, callback)
+            raise RuntimeError("A parallel worker failed with:\n%s"
+                               % failures[0].tb)
         return result
 
-    def fcaller(self, f, args, num):
-        self.outqueue.put((num, f(*args)))
+    def imap(self, f, argtuple, state=None, maxtasks=None):
+        """Like map, but lazily yields the results, in order, as they come.
+
+        At most 'maxtasks' (default: twice the number of workers) results
+        are queued, running, or waiting to be yielded at any time. Closing
+        the generator early waits for the tasks still running.
+        """
+        payload = self._prepare(state)
+        arglist = list(argtuple)
+        if maxtasks is None:
+            maxtasks = 2 * self.nprocs
+        done = {}
+        nsent = nrecv = nyielded = 0
+        try:
+            while nyielded < len(arglist):
+                while (nsent < len(arglist) and
+                       nsent - nyielded < max(1, maxtasks)):
+                    self.inqueue.put((nsent, f, arglist[nsent], self._gen,
+                                      payload))
+                    nsent += 1
+                num, r = self._get()
+                nrecv += 1
+                if isinstance(r, _WorkerFailure):
+                    if payload is not None and r.stale and not nyielded:
+                        # Workers can't see objects created after they were
+                        #  forked. Start over with fresh ones.
+                        while nrecv < nsent:
+                            self._get()
+                            nrecv += 1
+                        self._lose_persistence("their state references "
+                                               "objects they can't see:\n%s"
+                                               % r.tb.strip())
+                        for r in self.imap(f, arglist, state, maxtasks):
+                            yield r
+                        return
+                    raise RuntimeError("A parallel worker failed with:\n%s"
+                                       % r.tb)
+                done[num] = r
+                while nyielded in done:
+                    r = done.pop(nyielded)
+                    nyielded += 1
+                    yield r
+        finally:
+            # Leftovers must not be picked up by later calls.
+            while nrecv < nsent and self.alive:
+                self._get()
+                nrecv += 1
+            self._drop_statefile()
+
+    def _prepare(self, state):
+        """Gets the workers ready and returns the state payload to send."""
+        if not self.alive:
+            self.restart()
+        payload = None
+        if state is not None and not self._fresh:
+            try:
+                pickled = _dumps_state(state, self.rdr, self._inherited)
+                fd, payload = tempfile.mkstemp(prefix='mdreader_',
+                                               suffix='.state',
+                                               dir=_shared_tmpdir(
+                                                   len(pickled)))
+                self._statefile = payload
+                with os.fdopen(fd, 'wb') as statefile:
+                    statefile.write(pickled)
+            except (pickle.PicklingError, AttributeError, TypeError,
+                    RuntimeError):
+                # RuntimeError: recursion, with mutually recursive lambdas.
+                if not self.inherits:
+                    raise ValueError("Parallel workers started with the '%s' "
+                                     "method need a picklable per-frame "
+                                     "function and arguments (including "
+                                     "whatever the function uses from its "
+                                     "closure or globals).\n%s"
+                                     % (multiprocessing.get_start_method(),
+                                        sys.exc_info()[1]))
+                self._lose_persistence("the per-frame function or its "
+                                       "arguments can't be pickled (%s)"
+                                       % sys.exc_info()[1])
+        self._fresh = False
+        self._gen += 1
+        return payload
+
+    def _get(self):
+        # Execution halts here waiting for output, but we don't want to
+        #  hang forever if a worker dies on us.
+        while True:
+            try:
+                return self.outqueue.get(timeout=1)
+            except six.moves.queue.Empty:
+                if not self.alive:
+                    self.close()
+                    raise RuntimeError("A parallel worker died unexpectedly.")
+
+
+class ThreadPool(Pool):
+    """A persistent pool of worker threads, with the same interface as Pool.
+
+    Each thread works on a shallow copy of the reader, so that iteration
+    attributes don't get mixed up, and gets its own trajectory reader
+    (MDreader.trajectory is thread-local). Everything else, including
+    topology and result arrays, is shared. Worth it only when the per-frame
+    work mostly releases the GIL (NumPy, trajectory decoding).
+    """
+    def start(self):
+        self.inqueue = six.moves.queue.Queue()
+        self.outqueue = six.moves.queue.Queue()
+        self.procs = [threading.Thread(target=_pool_worker,
+                                       args=(self.rdr._thread_copy(),
+                                             self.inqueue, self.outqueue,
+                                             _init_thread_worker))
+                      for i in range(self.nprocs)]
+        for proc in self.procs:
+            proc.daemon = True
+            proc.start()
+        self._fresh = False
+
+    def close(self):
+        if not self.procs:
+            return
+        for proc in self.procs:
+            if proc.is_alive():
+                self.inqueue.put(None)
+        for proc in self.procs:
+            proc.join()
+        self.procs = []
+
+    def _prepare(self, state):
+        if not self.alive:
+            self.restart()
+        self._gen += 1
+        # No pickling needed: threads see the very same objects.
+        return state
 
 
 class ProperFormatter(argparse.ArgumentDefaultsHelpFormatter):
@@ -360,38 +1386,817 @@ class memoryCheck():
         return int(totalPages*bytperPage/(1024**2))
 
 
-class SeriesCdx():
-    """ Placeholder class for a variable behavior of Timeseries.coords"""
-    def __init__(self):
+class _SharedArrays():
+    """A set of arrays laid out in a single file-backed shared memory block.
+
+    Instances are small and picklable: they hold only the backing file path
+    and the array layout, so that running worker processes can map the very
+    same memory and write into it directly. 'specs' is a sequence of
+    (key, shape, dtype) tuples.
+    """
+    _align = 64
+
+    def __init__(self, specs, dirname=None):
+        self.layout = []
+        size = 0
+        for key, shape, dtype in specs:
+            dtype = np.dtype(dtype)
+            self.layout.append((key, size, tuple(shape), dtype.str))
+            nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+            size += -(-nbytes // self._align) * self._align
+        if dirname is None:
+            dirname = _shared_tmpdir(size)
+        fd, self.path = tempfile.mkstemp(prefix='mdreader_', suffix='.shm',
+                                         dir=dirname)
+        with os.fdopen(fd, 'wb') as shmfile:
+            shmfile.truncate(max(size, 1))
+            # A sparse file could still run out of space as workers fill
+            #  it in. Reserving it all now fails here instead, cleanly.
+            try:
+                if size and hasattr(os, 'posix_fallocate'):
+                    os.posix_fallocate(shmfile.fileno(), 0, size)
+            except OSError as err:
+                if err.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                    os.remove(self.path)
+                    raise_error(EnvironmentError,
+                                "Can't allocate the %d MB needed for the "
+                                "extracted arrays under %s (%s). Consider "
+                                "extracting to disk, by setting 'out' or "
+                                "MDreader.tseries_spill."
+                                % (size/(1024**2), dirname, err.strerror))
+
+    def arrays(self):
+        """Returns a dict of the arrays, keyed as in the specs."""
+        # Empty arrays can't be mmapped (nor need to be shared).
+        return dict((key, np.asarray(np.memmap(self.path, dtype=dtype,
+                                               mode='r+', offset=offset,
+                                               shape=shape))
+                          if np.prod(shape) else np.empty(shape, dtype=dtype))
+                    for key, offset, shape, dtype in self.layout)
+
+    def unlink(self):
+        """Removes the backing file. Already mapped arrays remain valid."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _NpyArrays(_SharedArrays):
+    """Same interface as _SharedArrays, for arrays kept in .npy files.
+
+    The 'main' key's array is stored under 'path' and the others in
+    same-named files alongside. Files are only created (with their headers)
+    if 'create' is True; otherwise they're expected to exist already.
+    Files are kept, unless 'temporary' is True.
+    """
+    def __init__(self, specs, path, main='_cdx', create=True,
+                 temporary=False):
+        root = path[:-4] if path.endswith('.npy') else path
+        self.temporary = temporary
+        self.layout = []
+        for key, shape, dtype in specs:
+            fname = path if key == main else "%s.%s.npy" % (root, key)
+            self.layout.append((key, fname))
+            if create:
+                check_outfile(fname)
+                npy = np.lib.format.open_memmap(fname, mode='w+',
+                                                dtype=np.dtype(dtype),
+                                                shape=tuple(shape))
+                del npy
+
+    def arrays(self):
+        return dict((key, np.asarray(np.lib.format.open_memmap(fname,
+                                                               mode='r+')))
+                    for key, fname in self.layout)
+
+    def unlink(self):
+        """Removes temporary files. Already mapped arrays remain valid."""
+        if not self.temporary:
+            # These are output files. We keep them.
+            return
+        for key, fname in self.layout:
+            if os.path.exists(fname):
+                os.remove(fname)
+
+
+class _LocalArrays(_SharedArrays):
+    """Same interface as _SharedArrays, for workers sharing our memory."""
+    def __init__(self, specs):
+        self._arrays = dict((key, np.empty(shape, dtype=dtype))
+                            for key, shape, dtype in specs)
+
+    def arrays(self):
+        return self._arrays.copy()
+
+    def unlink(self):
         pass
 
 
+class _ExtractionPlan():
+    """Per-frame coordinate extraction, worked out once per extraction.
+
+    Calling the plan with a frame's full positions array copies the
+    selected atoms' selected coordinates straight into 'out' (an extracted
+    array row), without building AtomGroups or intermediate arrays.
+    Indices that come in long contiguous runs are copied as slices;
+    otherwise, a single np.take over precomputed flat indices is used.
+    Rows of compact dtypes are first extracted into a float32 scratch row,
+    and then converted; if 'scale' is set, to fixed-point integers (values
+    out of range are clipped, with a warning the first time).
+    """
+    # Minimum average run length for run-wise slice copies to pay off.
+    min_run = 16
+
+    def __init__(self, ndx, xyz, dtype=np.float32, scale=None):
+        ndx = np.asarray(ndx, dtype=np.intp)
+        cols = np.flatnonzero(xyz)
+        self.ncols = len(cols)
+        if len(cols) == 3:
+            self.cols = slice(None)
+        elif len(cols) and cols[-1] - cols[0] + 1 == len(cols):
+            self.cols = slice(cols[0], cols[-1] + 1)
+        else:
+            self.cols = cols
+        breaks = np.flatnonzero(np.diff(ndx) != 1) + 1
+        starts = np.concatenate(([0], breaks))
+        stops = np.concatenate((breaks, [len(ndx)]))
+        self.runs = None
+        if len(ndx) and len(starts) * self.min_run <= len(ndx):
+            # (destination rows, source rows) slices of each run.
+            self.runs = [(slice(start, stop),
+                          slice(ndx[start], ndx[start] + stop - start))
+                         for start, stop in zip(starts, stops)]
+        self.ndx = ndx
+        self.flat = (ndx[:, np.newaxis] * 3 + cols).ravel()
+        self.dtype = np.dtype(dtype)
+        self.scale = scale
+        self.scratch = None
+        self.clipped = False
+        if self.dtype != np.float32:
+            self.scratch = np.empty((len(ndx), self.ncols), dtype=np.float32)
+
+    def __call__(self, positions, out):
+        if self.scratch is not None:
+            self._extract(positions, self.scratch)
+            if self.scale is not None:
+                info = np.iinfo(self.dtype)
+                np.multiply(self.scratch, self.scale, out=self.scratch)
+                np.rint(self.scratch, out=self.scratch)
+                if not self.clipped and self.scratch.size and (
+                        self.scratch.min() < info.min or
+                        self.scratch.max() > info.max):
+                    self.clipped = True
+                    sys.stderr.write("Warning: coordinates out of the %s "
+                                     "range at scale %g were clipped. Use a "
+                                     "smaller 'scale', or a wider 'dtype'.\n"
+                                     % (self.dtype.name, self.scale))
+                np.clip(self.scratch, info.min, info.max, out=self.scratch)
+            out[...] = self.scratch
+        else:
+            self._extract(positions, out)
+
+    def _extract(self, positions, out):
+        if self.runs is not None:
+            for dest, src in self.runs:
+                out[dest] = positions[src, self.cols]
+        elif out.flags.c_contiguous and positions.flags.c_contiguous:
+            np.take(positions.reshape(-1), self.flat, out=out.reshape(-1),
+                    mode='clip')
+        else:
+            out[...] = positions.reshape(-1)[self.flat].reshape(out.shape)
+
+
+class _Reduction():
+    """A per-frame reduction of atom coordinates to (weighted) centers.
+
+    Atoms are sorted into contiguous segments, either a single one or one
+    per 'segments' value (e.g. residue indices), so that each frame's
+    centers take a single np.add.reduceat. Calling the reduction with a
+    frame's full positions array writes the centers into 'out' (a row of
+    shape 'shape'). Sums are accumulated in float64.
+    """
+    def __init__(self, ndx, xyz, weights=None, segments=None):
+        # Kept for saving, and recreating the reduction.
+        self.args = (ndx, xyz, weights, segments)
+        ndx = np.asarray(ndx, dtype=np.intp)
+        cols = np.flatnonzero(xyz)
+        if segments is None:
+            order = np.arange(len(ndx))
+            self.starts = np.array([0])
+            self.shape = (len(cols),)
+        else:
+            order = np.argsort(segments, kind='mergesort')
+            segments = np.asarray(segments)[order]
+            self.starts = np.flatnonzero(np.concatenate(
+                                ([True], segments[1:] != segments[:-1])))
+            self.shape = (len(self.starts), len(cols))
+        ndx = ndx[order]
+        self.flat = (ndx[:, np.newaxis] * 3 + cols).ravel()
+        self.ncols = len(cols)
+        if weights is None:
+            self.weights = None
+            totals = np.diff(np.concatenate((self.starts, [len(ndx)])))
+        else:
+            self.weights = np.asarray(weights, dtype=np.float64)[order,
+                                                                np.newaxis]
+            totals = np.add.reduceat(self.weights[:, 0], self.starts)
+        self.norm = 1. / totals[:, np.newaxis]
+
+    def __call__(self, positions, out):
+        pos = positions.reshape(-1).take(self.flat).reshape(-1, self.ncols)
+        if self.weights is not None:
+            pos = pos * self.weights
+        sums = np.add.reduceat(pos, self.starts, axis=0, dtype=np.float64)
+        out[...] = (sums * self.norm).reshape(self.shape)
+
+
+class _Dequantized(np.lib.mixins.NDArrayOperatorsMixin):
+    """A read-only float32 view of coordinates stored in a compact dtype.
+
+    Indexing dequantizes only the selected elements; np.asarray() gets the
+    whole float32 array. 'scale' is the fixed-point scale factor of integer
+    data, or None for float16 data. Arithmetic, numpy functions and other
+    ndarray attributes (.mean(), .copy(), ...) work on the whole float32
+    array.
+    """
+    def __init__(self, raw, scale=None):
+        self.raw = raw
+        self.scale = scale
+
+    def __getattr__(self, name):
+        # Only for what we don't define ourselves. Special and private
+        #  names are left alone (e.g. for pickling, before 'raw' is set).
+        if name.startswith('_') or name in ('raw', 'scale'):
+            raise AttributeError(name)
+        return getattr(np.asarray(self), name)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if any(isinstance(arr, _Dequantized)
+               for arr in kwargs.get('out', ())):
+            # We're read-only.
+            return NotImplemented
+        inputs = tuple(np.asarray(arr) if isinstance(arr, _Dequantized)
+                       else arr for arr in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    @property
+    def ndim(self):
+        return self.raw.ndim
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float32)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, key):
+        arr = np.array(self.raw[key], dtype=np.float32)
+        if self.scale is not None:
+            arr /= np.float32(self.scale)
+        return arr
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self[...]
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr
+
+
+class _TseriesCache():
+    """An on-disk cache of timeseries extracted from a trajectory.
+
+    Entries are kept as .npy files under a directory per trajectory
+    fingerprint (the path, size and modification time of each trajectory
+    file). Each entry has a meta.npz file, written only once the entry is
+    complete, with the atom indices, xyz mask, props and frame range it
+    holds. An entry is reused for any request it fully covers. The
+    trajectory paths are listed in a 'trajfiles' file in each fingerprint
+    directory, so that stale ones can be told (see prune_tseries_cache),
+    along with the files' sizes and frame offsets ('offsets' is a list of
+    the per-file offset arrays, if known), so that trajectories that have
+    since grown can be told too.
+    """
+    def __init__(self, dirname, infiles, tseries, frames, offsets=None):
+        self.infiles = [os.path.abspath(fname) for fname in infiles]
+        self.dirname = os.path.join(dirname, _cache_digest(self.infiles))
+        if offsets is not None and any(rdr_offsets is None
+                                       for rdr_offsets in offsets):
+            # Some files' formats don't index frames.
+            offsets = None
+        self.offsets = offsets
+        self.ndx = np.asarray(tseries._tjcdx_ndx, dtype=int)
+        self.xyz = np.array(tseries._xyz, dtype=bool)
+        self.props = list(tseries._props)
+        self.dtype = np.dtype(tseries._dtype).str
+        self.scale = np.nan if tseries._scale is None else tseries._scale
+        # (first frame, skip, number of frames)
+        self.frames = frames
+
+    def _rows(self, meta):
+        """The slice of an entry's rows matching our frames, or None."""
+        start, skip, nframes = self.frames
+        c_start, c_skip, c_nframes = [int(val) for val in meta['frames']]
+        if start < c_start or (start - c_start) % c_skip:
+            return None
+        if nframes == 1:
+            step = 1
+        elif skip % c_skip:
+            return None
+        else:
+            step = skip // c_skip
+        first = (start - c_start) // c_skip
+        last = first + (nframes - 1) * step
+        if last >= c_nframes:
+            return None
+        return slice(first, last + 1, step)
+
+    def _covers(self, meta):
+        if not set(self.props).issubset(meta['props']):
+            return False
+        if len(self.ndx) and (
+                    str(meta.get('dtype', np.dtype(np.float32).str))
+                    != self.dtype or
+                    not np.allclose(meta.get('scale', np.nan), self.scale,
+                                    equal_nan=True)):
+            return False
+        if np.any(self.xyz & ~meta['xyz']):
+            return False
+        if len(self.ndx) and not np.array_equal(self.ndx, meta['ndx']):
+            # Entries of grouped extractions can only be reused as they are.
+            if np.any(np.diff(meta['ndx']) <= 0):
+                return False
+            pos = np.searchsorted(meta['ndx'], self.ndx)
+            if (np.any(pos >= len(meta['ndx'])) or
+                    not np.array_equal(meta['ndx'][pos], self.ndx)):
+                return False
+        return self._rows(meta) is not None
+
+    def lookup(self):
+        """Returns the dir of an entry covering our request, or None."""
+        if not os.path.isdir(self.dirname):
+            return None
+        for name in sorted(os.listdir(self.dirname)):
+            entry = os.path.join(self.dirname, name)
+            try:
+                with np.load(os.path.join(entry, 'meta.npz')) as meta:
+                    meta = dict(meta)
+            except (IOError, OSError, ValueError):
+                # Incomplete, or not an entry at all.
+                continue
+            if self._covers(meta):
+                return entry
+        return None
+
+    def _make_dir(self):
+        """Creates our fingerprint dir, if needed."""
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname)
+        listname = os.path.join(self.dirname, 'trajfiles')
+        if os.path.exists(listname):
+            return
+        if self.offsets is not None:
+            fd, tmpname = tempfile.mkstemp(dir=self.dirname, suffix='.npz')
+            with os.fdopen(fd, 'wb') as offsetsfile:
+                np.savez(offsetsfile, *self.offsets,
+                         sizes=[os.path.getsize(fname)
+                                for fname in self.infiles])
+            _umask_chmod(tmpname)
+            os.rename(tmpname, os.path.join(self.dirname, 'offsets.npz'))
+        # Written last: it's what marks the dir as complete.
+        fd, tmpname = tempfile.mkstemp(dir=self.dirname)
+        with os.fdopen(fd, 'wb') as listfile:
+            listfile.write('\n'.join(self.infiles).encode('utf-8'))
+        _umask_chmod(tmpname)
+        os.rename(tmpname, listname)
+
+    def new_entry(self):
+        """Creates the dir of a new, still incomplete, entry."""
+        self._make_dir()
+        return tempfile.mkdtemp(prefix='entry_', dir=self.dirname)
+
+    def _grown_from(self, fpdir):
+        """Whether our trajectory files extend those of fingerprint dir fpdir.
+
+        That is, if they're the same files, with frames since appended to
+        the last one (the others being unchanged).
+        """
+        if self.offsets is None:
+            return False
+        try:
+            with open(os.path.join(fpdir, 'trajfiles'), 'rb') as listfile:
+                infiles = listfile.read().decode('utf-8').split('\n')
+            with np.load(os.path.join(fpdir, 'offsets.npz')) as stored:
+                sizes = stored['sizes']
+                offsets = [stored['arr_%d' % i] for i in range(len(sizes))]
+        except (IOError, OSError, ValueError, KeyError):
+            return False
+        if infiles != self.infiles:
+            return False
+        for i, (fname, size, old, new) in enumerate(zip(infiles, sizes,
+                                                         offsets,
+                                                         self.offsets)):
+            if i < len(infiles) - 1:
+                if (os.path.getsize(fname) != size or
+                        not np.array_equal(old, new)):
+                    return False
+            elif (os.path.getsize(fname) < size or len(new) < len(old) or
+                    not np.array_equal(new[:len(old)], old)):
+                return False
+        return True
+
+    def _extendable(self, meta):
+        """How many of our frames an entry holds, if it only lacks frames.
+
+        Only entries with our very atoms, coordinates, props, dtype, scale,
+        starting frame and skip can be extended; 0 is returned otherwise.
+        """
+        start, skip, nframes = self.frames
+        c_start, c_skip, c_nframes = [int(val) for val in meta['frames']]
+        if ((c_start, c_skip) != (start, skip) or c_nframes >= nframes or
+                set(self.props) != set(meta['props']) or
+                not np.array_equal(self.xyz, meta['xyz']) or
+                not np.array_equal(self.ndx, meta['ndx'])):
+            return 0
+        if len(self.ndx) and (
+                    str(meta.get('dtype', np.dtype(np.float32).str))
+                    != self.dtype or
+                    not np.allclose(meta.get('scale', np.nan), self.scale,
+                                    equal_nan=True)):
+            return 0
+        return c_nframes
+
+    def lookup_grown(self):
+        """Finds an entry extracted before the trajectory grew.
+
+        Returns (entry dir, number of frames it holds), or None. The entry
+        can then be extended with the remaining frames (see adopt).
+        """
+        parent = os.path.dirname(self.dirname)
+        if not os.path.isdir(parent):
+            return None
+        for name in sorted(os.listdir(parent)):
+            fpdir = os.path.join(parent, name)
+            if fpdir == self.dirname or not self._grown_from(fpdir):
+                continue
+            for ename in sorted(os.listdir(fpdir)):
+                entry = os.path.join(fpdir, ename)
+                try:
+                    with np.load(os.path.join(entry, 'meta.npz')) as meta:
+                        meta = dict(meta)
+                except (IOError, OSError, ValueError):
+                    continue
+                nstored = self._extendable(meta)
+                if nstored:
+                    return entry, nstored
+        return None
+
+    def adopt(self, entry):
+        """Moves an entry found by lookup_grown under our fingerprint.
+
+        The entry is left incomplete, to be extended and committed. Its old
+        fingerprint dir is removed if no other entries are left there.
+        """
+        os.remove(os.path.join(entry, 'meta.npz'))
+        self._make_dir()
+        fpdir, name = os.path.split(entry)
+        adopted = os.path.join(self.dirname, name)
+        os.rename(entry, adopted)
+        if not [name for name in os.listdir(fpdir)
+                if name.startswith('entry_')]:
+            shutil.rmtree(fpdir, ignore_errors=True)
+        return adopted
+
+    def append(self, entry, tail):
+        """Appends the arrays of Timeseries tail to an entry's files."""
+        keys = ['_cdx'] if len(self.ndx) else []
+        keys.extend(self.props)
+        layout = _NpyArrays([(key, None, None) for key in keys],
+                            os.path.join(entry, '_cdx.npy'),
+                            create=False).layout
+        for key, fname in layout:
+            _npy_append(fname, getattr(tail, key))
+
+    def discard(self, entry):
+        """Removes an entry that couldn't be completed."""
+        shutil.rmtree(entry, ignore_errors=True)
+
+    def commit(self, entry):
+        """Marks a new entry as complete, so it can be found by lookup."""
+        fd, tmpname = tempfile.mkstemp(dir=entry, suffix='.npz')
+        with os.fdopen(fd, 'wb') as metafile:
+            np.savez(metafile, ndx=self.ndx, xyz=self.xyz,
+                     props=np.array(self.props, dtype=str),
+                     frames=np.array(self.frames), dtype=self.dtype,
+                     scale=self.scale)
+        _umask_chmod(tmpname)
+        os.rename(tmpname, os.path.join(entry, 'meta.npz'))
+
+    def load(self, entry, tseries):
+        """Sets tseries arrays from an entry, as copy-on-write memmaps.
+
+        Our frame range is a view of the entry's arrays; only a subset of
+        its atoms or coordinates requires a copy.
+        """
+        with np.load(os.path.join(entry, 'meta.npz')) as meta:
+            meta = dict(meta)
+        rows = self._rows(meta)
+        keys = ['_cdx'] if len(meta['ndx']) else []
+        keys.extend(meta['props'])
+        layout = dict(_NpyArrays([(key, None, None) for key in keys],
+                                 os.path.join(entry, '_cdx.npy'),
+                                 create=False).layout)
+        if len(self.ndx):
+            cdx = np.load(layout['_cdx'], mmap_mode='c')[rows]
+            if not np.array_equal(self.ndx, meta['ndx']):
+                cdx = cdx[:, np.searchsorted(meta['ndx'], self.ndx)]
+            if not np.array_equal(self.xyz, meta['xyz']):
+                cols = np.searchsorted(np.flatnonzero(meta['xyz']),
+                                       np.flatnonzero(self.xyz))
+                cdx = cdx[:, :, cols]
+            tseries._cdx = cdx
+        for attr in self.props:
+            setattr(tseries, attr, np.load(layout[attr], mmap_mode='c')[rows])
+
+
+def _cache_digest(infiles):
+    """The name of the timeseries cache dir for trajectory files infiles."""
+    keys = [_offsets_key(fname) for fname in infiles]
+    return hashlib.md5(repr(keys).encode('utf-8')).hexdigest()
+
+def prune_tseries_cache(dirname):
+    """Removes stale entries from a timeseries cache directory.
+
+    Entries are stale once any of their trajectory files has been deleted,
+    or changed in size or modification time; they can then never be used
+    again. Returns the list of removed fingerprint directories.
+    """
+    removed = []
+    if not os.path.isdir(dirname):
+        return removed
+    for name in sorted(os.listdir(dirname)):
+        fpdir = os.path.join(dirname, name)
+        try:
+            with open(os.path.join(fpdir, 'trajfiles'), 'rb') as listfile:
+                infiles = listfile.read().decode('utf-8').split('\n')
+        except (IOError, OSError):
+            # Not a fingerprint dir (or one being created).
+            continue
+        try:
+            if _cache_digest(infiles) == name:
+                continue
+        except OSError:
+            # A trajectory file is gone.
+            pass
+        shutil.rmtree(fpdir, ignore_errors=True)
+        removed.append(fpdir)
+    return removed
+
+
+class SeriesCdx():
+    """ Accessor for the per-group arrays of a tuple-mode Timeseries.coords"""
+    def __init__(self, tseries):
+        self._tseries = tseries
+
+    def __getitem__(self, n):
+        return self._tseries._group_coords(n)
+
+    def __len__(self):
+        return len(self._tseries._tjcdx_relndx)
+
+
 class Timeseries():
+    # Format version of saved Timeseries.
+    _store_version = 1
+
     def __getstate__(self):
         statedict = self.__dict__.copy()
-        for attr in ["coords","_coords","_cdx_unpacker"]:
+        for attr in ["coords","_coords","_groups"]:
             if attr in statedict:
                 del statedict[attr]
         return statedict
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._coords = SeriesCdx(self)
+        self._groups = {}
+
     def __init__(self):
-        self._coords = SeriesCdx()
+        self._coords = SeriesCdx(self)
         self._props = []
+        # (name, _Reduction) of the quantities computed during extraction.
+        self._compute = []
         self._tjcdx_ndx = []
         self._tjcdx_relndx = []
         self._cdx = None
         self._xyz = (True, True, True)
         self._coords_istuple = False
-        def _cdx_unpacker(n):
-            return self._cdx[:,self._tjcdx_relndx[n]]
-        self._coords.__getitem__ = _cdx_unpacker
+        self._shared = None
+        # Storage dtype of _cdx, and fixed-point scale factor of integer ones.
+        self._dtype = np.dtype(np.float32).str
+        self._scale = None
+        # Set to (dirname, mmap_mode) when loaded from disk.
+        self._store = None
+        self._groups = {}
+        # (first frame, skip, number of frames) and trajectory files the
+        #  Timeseries was extracted from.
+        self._frames = None
+        self._trajfiles = None
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: arrays of a loaded Timeseries
+        #  that haven't been read yet.
+        store = self.__dict__.get('_store')
+        if store is None or name.startswith('__'):
+            raise AttributeError(name)
+        if name == '_cdx':
+            if not len(self._tjcdx_ndx):
+                arr = None
+            elif not self._coords_istuple:
+                arr = self._load_array('coords_0')
+            else:
+                arr = np.empty((self._nframes, len(self._tjcdx_ndx),
+                                sum(self._xyz)), dtype=self._dtype)
+                for n, relndx in enumerate(self._tjcdx_relndx):
+                    arr[:, relndx] = self._group_raw(n)
+        elif (name in self._props or
+                name in [cname for cname, reduction in self._compute]):
+            arr = self._load_array(name)
+        else:
+            raise AttributeError(name)
+        setattr(self, name, arr)
+        return arr
 
     @property
     def coords(self):
         if self._coords_istuple:
             return self._coords
         else:
-            return self._cdx
+            return self._dequantized(self._cdx)
+
+    def _dequantized(self, raw):
+        """raw, or a float32 view of it if stored in a compact dtype."""
+        if raw is None or raw.dtype == np.float32:
+            return raw
+        return _Dequantized(raw, self._scale)
+
+    def _group_coords(self, n):
+        """The coordinates array of the n-th of a tuple of groups."""
+        return self._dequantized(self._group_raw(n))
+
+    def _group_raw(self, n):
+        """The n-th group's coordinates, as stored.
+
+        Groups stored as a contiguous run of _cdx atoms (always the case with
+        timeseries(..., grouped=True)) get a view of _cdx, created once.
+        Others get a new copy at each call.
+        """
+        n = range(len(self._tjcdx_relndx))[n]
+        if self._store is not None:
+            if n not in self._groups:
+                self._groups[n] = (None, self._load_array('coords_%d' % n))
+            return self._groups[n][1]
+        # Cached views are only valid while _cdx isn't replaced.
+        cdx, view = self._groups.get(n, (None, None))
+        if view is not None and cdx is self._cdx:
+            return view
+        relndx = self._tjcdx_relndx[n]
+        if len(relndx) and np.all(np.diff(relndx) == 1):
+            view = self._cdx[:,relndx[0]:relndx[-1]+1]
+            self._groups[n] = (self._cdx, view)
+            return view
+        return self._cdx[:,relndx]
+
+    def _load_array(self, key):
+        dirname, mmap_mode = self._store
+        return np.load(os.path.join(dirname, '%s.npy' % key),
+                       mmap_mode=mmap_mode)
+
+    def save(self, dirname):
+        """Saves the Timeseries arrays as .npy files under dirname.
+
+        Each coordinate group (the single one, or each of a tuple of them)
+        goes to its own coords_<n>.npy file (in its storage dtype), and each
+        prop or computed quantity to a same-named .npy file. A meta.npz
+        header, written last, describes the atoms, coordinates, props and
+        frames stored. AtomGroups aren't saved.
+        See Timeseries.load().
+        """
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        check_outfile(os.path.join(dirname, 'meta.npz'))
+        nframes = 0
+        for key, arr in self._stored_arrays():
+            np.save(os.path.join(dirname, '%s.npy' % key), arr)
+            nframes = len(arr)
+        self._save_meta(dirname, nframes)
+
+    def _stored_arrays(self):
+        """(file key, array) of each array to save."""
+        stored = []
+        if len(self._tjcdx_ndx):
+            if self._coords_istuple:
+                stored.extend(('coords_%d' % n, self._group_raw(n))
+                              for n in range(len(self._tjcdx_relndx)))
+            else:
+                stored.append(('coords_0', self._cdx))
+        for attr in self._props + [name for name, red in self._compute]:
+            stored.append((attr, getattr(self, attr)))
+        return stored
+
+    def _save_meta(self, dirname, nframes):
+        relndx = [np.asarray(ndx, dtype=int) for ndx in self._tjcdx_relndx]
+        computed = [name for name, reduction in self._compute]
+        reductions = {}
+        for n, (name, reduction) in enumerate(self._compute):
+            ndx, xyz, weights, segments = reduction.args
+            reductions['compute_ndx_%d' % n] = ndx
+            # Empty for None (groups can't be empty).
+            reductions['compute_weights_%d' % n] = (np.empty(0)
+                                        if weights is None else weights)
+            reductions['compute_segments_%d' % n] = (np.empty(0, dtype=int)
+                                        if segments is None else segments)
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.npz')
+        with os.fdopen(fd, 'wb') as metafile:
+            np.savez(metafile, version=self._store_version,
+                     nframes=nframes,
+                     frames=np.empty(0, dtype=int) if self._frames is None
+                            else np.array(self._frames),
+                     trajfiles=np.array(self._trajfiles or [], dtype=str),
+                     ndx=np.asarray(self._tjcdx_ndx, dtype=int),
+                     relndx=np.concatenate(relndx) if relndx else
+                            np.empty(0, dtype=int),
+                     group_sizes=np.array([len(ndx) for ndx in relndx],
+                                          dtype=int),
+                     xyz=np.array(self._xyz, dtype=bool),
+                     dtype=np.dtype(self._dtype).str,
+                     scale=np.nan if self._scale is None else self._scale,
+                     istuple=self._coords_istuple,
+                     props=np.array(self._props, dtype=str),
+                     computed=np.array(computed, dtype=str), **reductions)
+        _umask_chmod(tmpname)
+        os.rename(tmpname, os.path.join(dirname, 'meta.npz'))
+
+    def _append_stored(self, tail):
+        """Appends the frames of tail to the files of a loaded Timeseries."""
+        dirname = self._store[0]
+        for key, arr in tail._stored_arrays():
+            _npy_append(os.path.join(dirname, '%s.npy' % key), arr)
+        self._nframes += tail._frames[2]
+        self._save_meta(dirname, self._nframes)
+        # Arrays already read are out of date.
+        for attr in ['_cdx'] + tail._props + [name for name, red
+                                              in tail._compute]:
+            self.__dict__.pop(attr, None)
+        self._groups = {}
+
+    @classmethod
+    def load(cls, dirname, mmap=True):
+        """Returns a Timeseries saved under dirname with Timeseries.save().
+
+        Arrays are only read from disk when first accessed, and then only
+        those needed: accessing coords[n] of a tuple of groups reads only
+        that group's file. If 'mmap' is True (the default) arrays are
+        copy-on-write memmaps, paged in as needed, and changes to them aren't
+        written back to the files.
+        """
+        metafile = check_file(os.path.join(dirname, 'meta.npz'))
+        with np.load(metafile) as meta:
+            meta = dict(meta)
+        if int(meta['version']) > cls._store_version:
+            raise_error(IOError, "Timeseries in %s was saved by a newer "
+                                 "version of mdreader." % dirname)
+        tseries = cls()
+        tseries._store = (dirname, 'c' if mmap else None)
+        tseries._nframes = int(meta['nframes'])
+        tseries._tjcdx_ndx = meta['ndx']
+        tseries._tjcdx_relndx = np.split(meta['relndx'],
+                                         np.cumsum(meta['group_sizes'][:-1]))
+        if not len(meta['group_sizes']):
+            tseries._tjcdx_relndx = []
+        tseries._xyz = tuple(bool(val) for val in meta['xyz'])
+        tseries._dtype = str(meta['dtype'])
+        if not np.isnan(meta['scale']):
+            tseries._scale = float(meta['scale'])
+        tseries._coords_istuple = bool(meta['istuple'])
+        tseries._props = [str(attr) for attr in meta['props']]
+        for n, name in enumerate(meta['computed']):
+            weights = meta['compute_weights_%d' % n]
+            segments = meta['compute_segments_%d' % n]
+            tseries._compute.append((str(name), _Reduction(
+                                        meta['compute_ndx_%d' % n],
+                                        tseries._xyz,
+                                        weights if len(weights) else None,
+                                        segments if len(segments) else None)))
+        if len(meta['frames']):
+            tseries._frames = tuple(int(val) for val in meta['frames'])
+        tseries._trajfiles = [str(fname) for fname in meta['trajfiles']]
+        # To be read lazily.
+        del tseries._cdx
+        return tseries
 
 
 class DummyParser():
@@ -510,6 +2315,10 @@ class MDreader(mda.Universe):
     supplied options, yielding frames as it goes. You'll probably want to use
     it as part of a for-loop header.
 
+    SMP parallel workers are started on the first parallel call and kept
+    alive, with their open trajectories, for reuse by subsequent calls. Use
+    the close() method, or a with-statement, to shut them down.
+
     argparse deprecates using the 'version' argument to __init__. If you need
     to set it, use the setargs method.
     
@@ -567,6 +2376,8 @@ class MDreader(mda.Universe):
         self._parsed = False
         self.hasindex = False
         self._nframes = None
+        self._offsets = None
+        self._frame_times = None
         # Stuff pertaining to progress output/parallelization
         self.parallel = False  # Whether to parallelize
         self.p_smp = False  # SMP parallelization (within the same machine)
@@ -579,12 +2390,27 @@ class MDreader(mda.Universe):
         self.framestr = "{1:3.0%}  "
         self.p_mode = 'block'
         self.p_overlap = 0
+        self.p_chunk = None
+        self.p_reduce = None
+        self._p_out = None
+        self._row_offset = 0
+        self.p_num_local = None
+        self.p_nranks = 1
+        self.p_backend = 'processes'
+        self.prefetch = 0
+        self.p_align_files = True
+        self.p_time_blocks = False
+        self.tseries_cache = None
+        self.tseries_spill = None
         self.p_num = None
         self.p_id = 0
         self.p_scale_dt = True
         self.p_mpi_keep_workers_alive = False
         self.p_parms_set = False
         self.i_parms_set = False
+        self._pool = None
+        # Per-thread trajectory readers, for the 'threads' backend.
+        self._tlocal = threading.local()
         # Whether to also return time/box arrays when extracting coordinates.
         self._cdx_meta = False
 
@@ -599,6 +2425,34 @@ class MDreader(mda.Universe):
     def p_fn(self):
         pass
 
+    @property
+    def trajectory(self):
+        tlocal_traj = getattr(self.__dict__.get('_tlocal'), 'trajectory', None)
+        if tlocal_traj is not None:
+            return tlocal_traj
+        return mda.Universe.trajectory.fget(self)
+
+    @trajectory.setter
+    def trajectory(self, value):
+        mda.Universe.trajectory.fset(self, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shuts down the persistent SMP worker pool and closes the trajectory.
+
+        Can also be achieved by using the MDreader as a context manager.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if self._parsed:
+            self.trajectory.close()
+
     def __len__(self):
         return self.totalframes
 
@@ -628,21 +2482,126 @@ class MDreader(mda.Universe):
             # Trajectory indexing can be slow. No need to do for every MPI
             #  worker: we just pass the offsets around.
             if not self.p_id or not self.mpi:
-                self._nframes = len(self.trajectory)
-                if self._nframes is None or self._nframes < 1:
-                    raise_error(IOError, 'No frames to be read.')
+                self._offsets = self._index_offsets()
             if self.mpi:
-                if hasattr(self.trajectory, "_TrjReader__offsets"):
-                    self.trajectory._TrjReader__offsets = self.comm.bcast(
-                                   self.trajectory._TrjReader__offsets, root=0)
-                    if self.p_id != 0:
-                        self.trajectory._TrjReader__numframes = len(
-                                           self.trajectory._TrjReader__offsets)
-                        self._nframes = len(self.trajectory._TrjReader__offsets)
-                elif self.p_id:
-                    self._nframes = len(self.trajectory)
+                self._offsets = self.comm.bcast(self._offsets, root=0)
+                if self.p_id:
+                    _set_traj_offsets(self.trajectory, self._offsets)
+            self._nframes = len(self.trajectory)
+            if self._nframes is None or self._nframes < 1:
+                raise_error(IOError, 'No frames to be read.')
         return self._nframes
 
+    def _prescan_offsets(self):
+        """Indexes multiple trajectory files concurrently, before loading.
+
+        Otherwise MDAnalysis' ChainReader indexes them one after the other
+        when loading. Files are split among the SMP workers and/or MPI ranks,
+        and the offsets of those not yet in the on-disk index are returned
+        in a dict keyed by absolute file path.
+        """
+        infiles = []
+        for fname in self._trajfiles():
+            if fname not in infiles:
+                infiles.append(fname)
+        if len(infiles) < 2 or not self.parallel:
+            return {}
+        if offset_index:
+            infiles = [fname for fname in infiles
+                       if not _offsets_stored(fname)]
+        if self.p_mpi:
+            infiles = infiles[self.p_id::self.p_nranks]
+        nprocs = min(self.p_num, len(infiles)) if self.p_smp else 1
+        if nprocs > 1:
+            # A throwaway pool: there's no Universe yet for our own to hold.
+            pool = multiprocessing.Pool(nprocs)
+            try:
+                offsets = pool.map(_index_trajfile, infiles, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            offsets = [_index_trajfile(fname) for fname in infiles]
+        prescanned = dict((os.path.abspath(fname), rdr_offsets)
+                          for fname, rdr_offsets in zip(infiles, offsets))
+        if self.p_mpi:
+            for rank_prescanned in self.comm.allgather(prescanned):
+                prescanned.update(rank_prescanned)
+        return prescanned
+
+    def _trajfiles(self):
+        """The trajectory file names, as a flat list."""
+        # A list passed as the default of the -f option ends up nested.
+        trajfiles = []
+        for fname in self.opts.infile:
+            if isinstance(fname, six.string_types):
+                trajfiles.append(fname)
+            else:
+                trajfiles.extend(fname)
+        return trajfiles
+
+    @property
+    def frame_times(self):
+        """The time of each frame, as an increasing array.
+
+        Times that reset along the trajectory (typically, when concatenating
+        files that each restart at zero) are continued after the preceding
+        frames. Times are stored in the on-disk frame index, XTC and TRR
+        times are read from frame headers, and DCD times computed from the
+        time step, so that getting times is fast, and doesn't decode any
+        coordinates, even for large trajectories. They're only needed (and
+        got) when -b or -e are set as times.
+        -b and -e times are interpreted over this timeline, which is also
+        what parallelization schemes can use to split work by time.
+        """
+        if self._frame_times is None:
+            nframes = self.nframes
+            if not self.p_id or not self.mpi:
+                times = []
+                rdrs = _traj_subreaders(self.trajectory)
+                offsets = self._offsets or [None] * len(rdrs)
+                for rdr, rdr_offsets in zip(rdrs, offsets):
+                    rdr_times = None
+                    if offset_index and rdr_offsets is not None:
+                        rdr_times = _load_offset_index(rdr.filename, 'times')
+                    if rdr_times is None or len(rdr_times) != len(rdr):
+                        rdr_times = _reader_times(rdr, rdr_offsets)
+                        if offset_index and rdr_offsets is not None:
+                            _save_offset_index(rdr.filename, rdr_offsets,
+                                               rdr_times)
+                    times.append(rdr_times)
+                self._frame_times = _continuous_times(np.concatenate(times))
+            if self.mpi:
+                self._frame_times = self.comm.bcast(self._frame_times, root=0)
+        return self._frame_times
+
+    def _index_offsets(self):
+        """Returns the frame offsets of each trajectory file.
+
+        Offsets are loaded from the on-disk index kept alongside each file,
+        if still valid. Otherwise the file is indexed (which can take a
+        while, for large files) and the index stored for the next time.
+        Readers that keep their own offset cache already have their offsets
+        by now. Files in formats that don't index frames get None.
+        """
+        offsets = []
+        for rdr in _traj_subreaders(self.trajectory):
+            rdr_offsets = None
+            if _keeps_own_offsets(rdr):
+                offsets.append(_reader_offsets(rdr))
+                continue
+            if offset_index and (hasattr(rdr, "_xdr") or
+                                 hasattr(rdr, "_TrjReader__offsets")):
+                rdr_offsets = _load_offset_index(rdr.filename)
+            if rdr_offsets is not None:
+                _set_reader_offsets(rdr, rdr_offsets)
+            else:
+                rdr_offsets = _reader_offsets(rdr)
+                if offset_index and rdr_offsets is not None:
+                    _save_offset_index(rdr.filename, rdr_offsets)
+            offsets.append(rdr_offsets)
+        return offsets
+
     @_with_defaults(_default_opts)
     def setargs(self, s, f, o, b, e, skip, np, v, version=None, check_files=None):
         """ Shortcut function for setting default parameters
@@ -686,7 +2645,9 @@ class MDreader(mda.Universe):
         parser.add_argument('-b', metavar='TIME/FRAME', dest='starttime',
                 default=b,
                 help = 'real\tTime to begin analysis from. If -fmn is set, '
-                    '-b takes instead an int, as the starting frame number.')
+                    '-b takes instead an int, as the starting frame number. '
+                    'When time restarts along the trajectory (as with '
+                    'concatenated files) it is taken to continue instead.')
         parser.add_argument('-e', metavar='TIME/FRAME', dest='endtime',
                 default=e,
                 help = 'real\tTime to end analysis at. If -fmn is set, -e '
@@ -706,9 +2667,11 @@ class MDreader(mda.Universe):
                     dest='parallel', default=np,
                     help = 'int \tNumber of processes to parallelize over when '
                     'iterating. 1 means serial iteration, and 0 uses the '
-                    'OS-reported number of cores. Ignored when using MPI, or '
-                    'when the script specifically sets the number of '
-                    'parallelization workers.')
+                    'OS-reported number of cores. Ignored when the script '
+                    'specifically sets the number of parallelization '
+                    'workers. Under MPI, sets instead the number of SMP '
+                    'workers per MPI rank (best run with one rank per node); '
+                    '0 or 1 means pure MPI parallelization.')
         parser.add_argument('-v', metavar='LEVEL', type=int, choices=[0,1,2],
                 dest='verbose', default=v,
                 help = 'enum\tVerbosity level. 0:quiet, 1:progress 2:debug')
@@ -838,9 +2801,16 @@ class MDreader(mda.Universe):
         #if self.opts.endtime is not None and self.opts.endtime < self.opts.starttime:
         #    raise_error(ValueError, 'Specified end time/frame lower than start time/frame.')
 
+        if self.mpi and self.p_num_local is None:
+            self.p_num_local = self.opts.parallel
         if not self.p_parms_set:
             self.set_parallel_parms(self.opts.parallel)
+        prescanned = self._prescan_offsets()
         mda.Universe.__init__(self, self.opts.topol, *self.opts.infile)
+        for rdr in _traj_subreaders(self.trajectory):
+            rdr_offsets = prescanned.get(os.path.abspath(rdr.filename))
+            if rdr_offsets is not None:
+                _set_reader_offsets(rdr, rdr_offsets)
 
         self.hastime = True
         if not hasattr(self.trajectory.ts, 'time') or self.trajectory.dt == 0.:
@@ -872,7 +2842,7 @@ class MDreader(mda.Universe):
         self._ndx_input()
         self._select_ndx_atgroups()
 
-    def iterate(self, p=None):
+    def iterate(self, p=None, prefetch=None):
         """Yields snapshots from the trajectory per 'start', 'end' and skip.
 
         Calculations on AtomSelections will automagically reflect the new
@@ -880,6 +2850,8 @@ class MDreader(mda.Universe):
         - 'p' sets the number of workers, overriding any already set. Note that
           MDreader is set to use all cores by default, so if you want serial
           iteration you must pass p=1.
+        - 'prefetch' sets MDreader.prefetch (see below), overriding any
+          already set.
         Other output and parallelization behavior will depend on a number of
         MDreader properties that are automatically set, but can be changed
         before invocation of iterate():
@@ -887,11 +2859,27 @@ class MDreader(mda.Universe):
             'both', 'empty', or None. It sets the output to frame numbers,
             %% progress, both, or nothing. If set to None behavior defaults to
             'frame', or 'pct' when iterating in parallel block mode.
-          - MDreader.p_mode (default: 'block') sets either 'interleaved' or
-            'block' parallel iteration.
-          - When MDreader.p_mode=='block' MDreader.p_overlap (default: 0) sets
-            how many frames blocks overlap, to allow multi frame analyses (say,
-            an average) to pick up earlier on each block.
+          - MDreader.p_mode (default: 'block') sets either 'interleaved',
+            'block', or 'dynamic' parallel iteration. In 'dynamic' mode the
+            frames are split into many small contiguous chunks that idle
+            workers pick up as they go, which balances uneven per-frame
+            costs. Under MPI 'dynamic' behaves as 'block'.
+          - MDreader.p_align_files (default: True) makes 'block' mode, when
+            reading several trajectory files, cut blocks at file boundaries
+            where that keeps blocks within 10%% of an even share of frames,
+            and otherwise split files into sub-blocks, so that each worker
+            mostly reads from a single file.
+          - MDreader.p_time_blocks (default: False) makes 'block' mode
+            instead split frames into blocks spanning equal simulation
+            times, rather than equal numbers of frames (which differ when
+            the time step changes between files). Blocks are cut over
+            MDreader.frame_times, without reading any frames.
+          - When MDreader.p_mode is 'block' or 'dynamic' MDreader.p_overlap
+            (default: 0) sets how many frames blocks overlap, to allow multi
+            frame analyses (say, an average) to pick up earlier on each block.
+          - MDreader.p_chunk (default: None) sets how many frames make up
+            each chunk in 'dynamic' mode. If None, frames are split into
+            about four chunks per worker.
           - MDreader.p_num (default: None) controls in how many blocks/segments
             to divide the iteration (the number of workers; will use all the
             processing cores if set to None).
@@ -903,18 +2891,37 @@ class MDreader(mda.Universe):
             always set a different p_id per worker when iterating in parallel,
             otherwise you'll end up with repeated trajectory chunks.
             **
+          - MDreader.p_backend (default: 'processes') sets whether SMP
+            workers are forked processes or 'threads'. Threads share all
+            memory and need no pickling, but only pay off if the per-frame
+            work releases the GIL (most NumPy operations, and the decoding
+            of XTC/TRR frames). Per-frame functions should then only access
+            frame data via the trajectory or AtomGroups, not via
+            MDreader.snapshot.
           - MDreader.p_scale_dt (default: True) controls whether the reported
             time per frame will be scaled by the number of workers, in order to
             provide an effective, albeit estimated, per-frame time.
+          - MDreader.prefetch (default: 0) sets how many frames ahead to
+            decode in a background thread, while the current one is being
+            worked on. This also applies within each parallel worker, and
+            pays off when decoding (of XTC files, for instance) and the
+            per-frame work both take a while. Frames are then read by a copy
+            of the trajectory reader, and the snapshot in
+            MDreader.trajectory.ts is only valid until the next iteration.
 
         """
         self.ensure_parsed()
 
         if p is not None:
             self.set_parallel_parms(p)
+        if prefetch is not None:
+            check_positive(prefetch)
+            self.prefetch = prefetch
         if not self.p_parms_set:
             self.set_parallel_parms()
-        verb = self.opts.verbose and (not self.parallel or self.p_id==0)
+        # Dynamic-mode progress is reported by the parent, per chunk.
+        verb = (self.opts.verbose and (not self.parallel or self.p_id==0)
+                and not (self.p_smp and self.p_mode == 'dynamic'))
         # We're only outputting after each worker has picked up on the
         # pre-averaging frames
         self.i_overlap = True
@@ -929,16 +2936,37 @@ class MDreader(mda.Universe):
         sys.stdout.flush()
         sys.stderr.flush()
 
+        frames = slice(self.i_startframe, self.i_endframe+1, self.i_skip)
+        traj = self.trajectory
+        if self.prefetch:
+            snapshots = iter(_Prefetcher(self._clone_traj(), frames,
+                                         self.prefetch, traj.ts))
+            orig_ts = traj.ts
+            last_frame = None
+        else:
+            snapshots = traj[frames]
+
         # The LOOP!
-        for self.snapshot in self.trajectory[self.i_startframe:
-                                             self.i_endframe+1:
-                                             self.i_skip]:
-            if self.i_overlap and self.iterframe >= self.p_overlap:
-                self.i_overlap = False # Done overlapping. Let the output begin!
-            if verb:
-                self._output_stats()
-            yield self.snapshot
-            self.iterframe += 1
+        try:
+            for self.snapshot in snapshots:
+                if self.prefetch:
+                    # Have AtomGroups read from the prefetched frame.
+                    traj.ts = self.snapshot
+                    last_frame = self.snapshot.frame
+                if self.i_overlap and self.iterframe >= self.p_overlap:
+                    self.i_overlap = False # Done overlapping. Let the output begin!
+                if verb:
+                    self._output_stats()
+                yield self.snapshot
+                self.iterframe += 1
+        finally:
+            if self.prefetch:
+                # Stop the read-ahead, and leave the trajectory at the last
+                #  frame, as when not prefetching.
+                snapshots.close()
+                traj.ts = orig_ts
+                if last_frame is not None:
+                    traj[last_frame]
         self.i_parms_set = False
         self.p_parms_set = False
 
@@ -1016,7 +3044,9 @@ class MDreader(mda.Universe):
                 sys.stderr.flush()
     
     def timeseries(self, coords=None, props=None,
-                   x=True, y=True, z=True, parallel=True):
+                   x=True, y=True, z=True, parallel=True, out=None,
+                   cache=None, dtype=np.float32, scale=None, grouped=False,
+                   compute=None):
         """Extracts coordinates and/or other time-dependent data from a trajectory.
 
         - 'coords' can be an AtomGroup, an int, a selection text, or a tuple of
@@ -1029,6 +3059,71 @@ class MDreader(mda.Universe):
         - 'parallel' (default=True) controls parallelization behavior.
         - 'x', 'y', and 'z' (default=True) set whether the three coordinates,
           or only a subset, are extracted.
+        - 'out' (default=None) can be set to a .npy file name, in which case
+          the coordinates are written directly to that file, in parallel, by
+          each worker or MPI rank, without being gathered in memory first.
+          Each prop goes to a same-named file alongside (out='x.npy' puts the
+          'time' prop in 'x.time.npy'). The returned Timeseries arrays are
+          then backed by these files.
+        - 'cache' (default=None, meaning MDreader.tseries_cache, itself
+          defaulting to None) can be set to a directory where extracted
+          arrays are kept as .npy files, keyed by the trajectory files' path,
+          size and modification time, and by the extracted atoms, coordinates,
+          props and frame range. If True, a .mdreader_cache directory is used
+          alongside the (first) trajectory file. Later extractions of the same
+          data, or of any subset of it, are then loaded from the cache, as
+          copy-on-write memmaps, instead of read from the trajectory. Beware
+          that trajectory transformations aren't part of the key. The cache
+          isn't used when 'out' is set. If frames have since been appended
+          to the (last) trajectory file, an entry of the very same atoms,
+          coordinates and props, from the same starting frame and with the
+          same skip, is extended with just the new frames (for XTC/TRR
+          files, whose frame offsets tell such growth apart). Entries for
+          trajectory files otherwise changed or deleted are never used
+          again; they can be removed with
+          mdreader.prune_tseries_cache(dirname).
+        - 'dtype' (default=numpy.float32) sets how coordinates are stored:
+          numpy.float16, or numpy.int16/numpy.int32 for fixed-point values,
+          take 2 to 4 times less memory (and disk, and inter-process traffic).
+          Fixed-point values are coordinates multiplied by 'scale' and
+          rounded; out-of-range values are clipped (with a warning).
+          'scale' (default=None) defaults to the largest that fits 1.25
+          times the first extracted frame's coordinate and box extent. The
+          resolution, 1/scale, is then that extent times 1.25/32767 for
+          int16 (0.011 for a 300 Angstrom box, so that values are off by at
+          most half that), and about 6e-10 times the extent for int32, well
+          below float32's own precision. Coordinates are still accessed as
+          float32 values through Timeseries.coords, which is then a view
+          that dequantizes only the elements indexed from it, or the whole
+          array for arithmetic and ndarray methods (numpy.asarray() gets a
+          plain float32 array). The compact array itself is Timeseries._cdx,
+          and the scale factor Timeseries._scale.
+        - 'grouped' (default=False) only applies when 'coords' is a tuple.
+          By default, the atoms of all groups are extracted once, into a
+          single array, and each Timeseries.coords[n] access returns a new
+          copy of the n-th group's atoms. If True, each group's atoms are
+          instead stored as a contiguous run of that array, atoms in more
+          than one group being stored once per group. Timeseries.coords[n] is
+          then a view, without any copying.
+        - 'compute' (default=None) can be a dict of quantities to compute
+          from the coordinates of each frame, during extraction, instead of
+          extracting the coordinates themselves. Keys are the names of the
+          Timeseries attributes to hold the results, and values
+          (kind, group) tuples. 'kind' can be 'cog' or 'com', for a group's
+          center of geometry or mass (an array of shape (frames, xyz)), or
+          'per_residue_cog' or 'per_residue_com', for the centers of each
+          residue's atoms in the group (shape (frames, residues, xyz)).
+          'group' is specified as each of a tuple of 'coords', and 'x', 'y'
+          and 'z' set which center coordinates are computed. Periodic
+          boundaries aren't taken into account. The cache isn't used when
+          'compute' is set.
+        If the data to extract would take more than half the memory an error
+        is raised, unless MDreader.tseries_spill (default=None) is set to a
+        directory (or to True, for the system's temp dir). Data is then
+        extracted to temporary .npy files there, as if with 'out', and the
+        returned arrays are file-backed memmaps, paged in and out of memory
+        as needed. The files are unlinked once mapped (or if extraction
+        fails), and thus freed along with the arrays.
 
         Will return a mdreader.Timeseries object, holding an array, or a tuple,
         for each coords, and having named properties holding the same-named
@@ -1058,10 +3153,410 @@ class MDreader(mda.Universe):
         # First things first
         self.ensure_parsed()
 
+        tjcdx_atgrps, mem = self._prepare_tseries(coords, props, x, y, z,
+                                                  dtype, scale, grouped,
+                                                  compute)
+        return self._extract_tseries(tjcdx_atgrps, mem, out, cache)
+
+    def _extract_tseries(self, tjcdx_atgrps, mem, out=None, cache=None):
+        """Extracts mdreader._tseries, as set up by _prepare_tseries.
+
+        'mem' is the memory needed per frame. Returns the Timeseries (None
+        on MPI ranks other than 0).
+        """
+        mem *= len(self)
+
+        tseries = self._tseries
+        if cache is None:
+            cache = self.tseries_cache
+        tcache = entry = None
+        hit = committed = False
+        if cache and out is None and not tseries._compute:
+            tcache = _TseriesCache(self._cache_dir(cache), self._trajfiles(),
+                                   tseries, (self.startframe, self.opts.skip,
+                                             self.totalframes), self._offsets)
+            grown = None
+            if not self.p_id:
+                entry = tcache.lookup()
+                hit = entry is not None
+                if not hit:
+                    grown = tcache.lookup_grown()
+                    if grown is None:
+                        entry = tcache.new_entry()
+            if self.p_mpi:
+                entry, hit, grown = self.comm.bcast((entry, hit, grown),
+                                                    root=0)
+            if grown is not None:
+                # The trajectory has grown since: only the new frames are
+                #  extracted, and appended to the existing entry.
+                entry = self._extend_cached(tcache, grown[0], grown[1], mem)
+                hit = True
+            if not hit:
+                # Extract straight into the new entry's files.
+                out = os.path.join(entry, '_cdx.npy')
+
+        # This is potentially a lot of memory. Check it beforehand,
+        # except for MPI, which we trust the user to do themselves.
+        spill = False
+        if not self.p_mpi and out is None and not hit:
+            avail_mem = memoryCheck()
+            if 2 * mem/(1024**2) > avail_mem.value:
+                if not self.tseries_spill:
+                    raise_error(EnvironmentError,
+                                "You are attempting to read approximately %d "
+                                "MB of coordinates/values but your system "
+                                "only seems to have %d MB of physical memory "
+                                "(and we need at least twice as much memory "
+                                "as read bytes). "
+                                "Consider extracting to disk, by setting "
+                                "'out' or MDreader.tseries_spill."
+                                % (mem/(1024**2), avail_mem.value))
+                spill = True
+                out = self._spill_file()
+
+        specs = self._tseries_specs(self.totalframes)
+        try:
+            if out is not None and not hit:
+                # Straight to disk: each worker/rank writes its own rows.
+                tseries._shared = self._npy_out(specs, out, temporary=spill)
+            if hit:
+                if self.p_id:
+                    tseries = None
+            elif self.p_mpi:
+                # Ranks extract overlap-free blocks, which are then gathered
+                #  in order straight into rank 0's preallocated arrays.
+                p_mode, p_overlap = self.p_mode, self.p_overlap
+                self.p_mode, self.p_overlap = 'block', 0
+                try:
+                    if self.p_smp:
+                        # Hybrid: local workers split this rank's block.
+                        saved = self._narrow_to_rank(0)
+                        try:
+                            if out is None:
+                                # Rank-local arrays, from row 0.
+                                self._row_offset = 0
+                                specs = self._tseries_specs(self.totalframes)
+                            self._smp_extract(tseries, specs, out)
+                        finally:
+                            self.__dict__.update(saved)
+                    else:
+                        self._extractor()
+                    counts = self._block_frames(self.p_nranks, 0)
+                finally:
+                    self.p_mode, self.p_overlap = p_mode, p_overlap
+                if out is not None:
+                    self.comm.Barrier()
+                    if self.p_id == 0:
+                        _set_shared_attrs(tseries)
+                else:
+                    for key, shape, dtype in self._tseries_specs(
+                            self.totalframes):
+                        if self.p_id == 0:
+                            full = np.empty(shape, dtype=dtype)
+                        else:
+                            full = None
+                        setattr(tseries, key,
+                                _mpi_gatherv(self.comm, getattr(tseries, key),
+                                             full, counts))
+                if self.p_id != 0:
+                    tseries = None
+            elif not self.p_smp:
+                self._extractor()
+                if out is not None:
+                    _set_shared_attrs(tseries)
+            else:
+                self._smp_extract(tseries, specs, out)
+            if tseries is not None:
+                tseries._shared = None
+                if tcache is not None:
+                    if not hit:
+                        tcache.commit(entry)
+                        committed = True
+                    # Loaded anew, so that changes to the arrays don't get
+                    #  written back to the cache.
+                    tcache.load(entry, tseries)
+        finally:
+            if spill:
+                # Also on errors, or Ctrl-C, the spill files are ours to
+                #  remove. Arrays mapped from them remain valid.
+                _NpyArrays(specs, out, create=False, temporary=True).unlink()
+            if (entry is not None and not hit and not committed and
+                    not self.p_id):
+                tcache.discard(entry)
+
+        if self.p_mpi and not self.p_mpi_keep_workers_alive and self.p_id != 0:
+            sys.exit(0)
+        else:
+            self._tseries = None
+            if tseries is not None:
+                tseries.atgrps = tjcdx_atgrps
+                tseries._frames = (self.startframe, self.opts.skip,
+                                   self.totalframes)
+                tseries._trajfiles = [os.path.abspath(fname)
+                                      for fname in self._trajfiles()]
+            self.p_parms_set = False
+            return tseries
+
+    def _extend_cached(self, tcache, entry, nstored, mem):
+        """Extends a cache entry holding our first nstored frames.
+
+        Returns the (re-keyed, and committed) entry dir on rank 0.
+        'mem' is the memory needed per frame.
+        """
+        tseries = self._tseries
+        if not self.p_id:
+            entry = tcache.adopt(entry)
+        saved = dict((attr, self.__dict__[attr]) for attr in
+                     ('_startframe', '_totalframes'))
+        self._startframe += nstored * self.opts.skip
+        self._totalframes -= nstored
+        try:
+            tail = self._extract_tseries(None, mem, cache=False)
+            if tail is not None:
+                tcache.append(entry, tail)
+                tcache.commit(entry)
+        except BaseException:
+            if not self.p_id:
+                tcache.discard(entry)
+            raise
+        finally:
+            self.__dict__.update(saved)
+            self._tseries = tseries
+        return entry
+
+    def extend_timeseries(self, tseries):
+        """Extends a Timeseries with the frames since added to the trajectory.
+
+        For trajectories still being written to: the trajectory files are
+        reopened, and only the frames following those already in tseries
+        are extracted (in parallel, as with MDreader.timeseries()), and
+        appended to tseries, which is returned. tseries can have been
+        returned by MDreader.timeseries(), in which case its arrays are
+        replaced by longer ones in memory, or by Timeseries.load(), in which
+        case the new frames are appended to its files, in place. It must
+        have been extracted from the same trajectory files, with the same
+        starting frame and skip. The end frame is that set by -e, as usual.
+        Under MPI, tseries only needs to be passed on rank 0 (it's ignored
+        on the others, which must keep alive, per
+        MDreader.p_mpi_keep_workers_alive).
+        Trajectory transformations are lost on reopening.
+        """
+        self.ensure_parsed()
+        if not self.p_id:
+            if tseries._frames is None:
+                raise_error(ValueError, "This Timeseries doesn't know the "
+                                        "frames it was extracted from.")
+            template = self._chunk_tseries(tseries, None, {})
+            template._frames = tseries._frames
+            template._trajfiles = tseries._trajfiles
+        else:
+            template = None
+        if self.p_mpi:
+            template = self.comm.bcast(template, root=0)
+        trajfiles = [os.path.abspath(fname) for fname in self._trajfiles()]
+        if template._trajfiles != trajfiles:
+            raise_error(ValueError, "The Timeseries was extracted from other "
+                                    "trajectory files (%s)."
+                                    % ", ".join(template._trajfiles))
+        start, skip, nframes = template._frames
+        self._reload_trajectory()
+        if (self.startframe, self.opts.skip) != (start, skip):
+            raise_error(ValueError, "The Timeseries was extracted starting "
+                        "from frame %d with a skip of %d, not from frame %d "
+                        "with a skip of %d." % (start, skip, self.startframe,
+                                                self.opts.skip))
+        if self.totalframes < nframes:
+            raise_error(ValueError, "The trajectory now has fewer frames "
+                        "than the Timeseries (%d vs %d)."
+                        % (self.totalframes, nframes))
+        if self.totalframes == nframes:
+            return tseries
+
+        self._tseries = template
+        for attr in template._props:
+            setattr(template, attr, None)
+        mem = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize
+                  for key, shape, dtype in self._tseries_specs(1))
+        saved = dict((attr, self.__dict__[attr]) for attr in
+                     ('_startframe', '_totalframes'))
+        self._startframe = start + nframes * skip
+        self._totalframes -= nframes
+        try:
+            tail = self._extract_tseries(None, mem, cache=False)
+        finally:
+            self.__dict__.update(saved)
+        if tail is None:
+            return None
+        if tseries._store is not None:
+            tseries._append_stored(tail)
+        else:
+            concat_tseries([tseries, tail], ret=tseries)
+        tseries._frames = (start, skip, self.totalframes)
+        return tseries
+
+    def _reload_trajectory(self):
+        """Reopens the trajectory files, to see frames added since."""
+        if self._pool is not None:
+            # Workers hold readers of the old trajectory.
+            self._pool.close()
+            self._pool = None
+        self.trajectory.close()
+        self.load_new(self._trajfiles())
+        self._nframes = None
+        self._offsets = None
+        self._frame_times = None
+        for attr in ('_startframe', '_endframe', '_totalframes'):
+            self.__dict__.pop(attr, None)
+        self.i_parms_set = False
+
+
+    def timeseries_chunks(self, coords=None, props=None, chunk=100,
+                          x=True, y=True, z=True, parallel=True, buffer=None,
+                          dtype=np.float32, scale=None, grouped=False,
+                          compute=None):
+        """Lazily yields the timeseries of consecutive chunks of frames.
+
+        Takes the same 'coords', 'props', 'x', 'y', 'z', 'dtype', 'scale',
+        'grouped' and 'compute' arguments as MDreader.timeseries(), and
+        yields, in trajectory order,
+        mdreader.Timeseries objects covering at most 'chunk' frames each.
+        Only a bounded number of chunks are extracted ahead of the one being
+        consumed: 'buffer' of them (default: twice the number of workers) in
+        SMP parallelization, and one per rank under MPI. Under MPI, chunks
+        are only yielded on the root rank. 'parallel' can be set to False to
+        force serial extraction.
+
+        Example:
+        hist = np.zeros(100, dtype=int)
+        for tseries in mdreader.timeseries_chunks("name PO4", chunk=1000):
+            hist += np.histogram(tseries.coords[..., 2], bins=100,
+                                 range=(0, 200))[0]
+
+        """
+        check_positive(chunk, strict=True)
+        self.ensure_parsed()
+        if not parallel:
+            self.set_parallel_parms(1)
+        elif not self.p_parms_set:
+            self.set_parallel_parms()
+
+        atgrps, mem = self._prepare_tseries(coords, props, x, y, z, dtype,
+                                            scale, grouped, compute)
+        template = self._tseries
+        nframes = self.totalframes
+        nchunks = -(-nframes // chunk)
+        if self.p_mpi:
+            # Each rank extracts a chunk in turn, which root then gathers.
+            for first in range(0, nchunks, self.p_nranks):
+                counts = [max(0, min(chunk, nframes - (first + rank) * chunk))
+                          for rank in range(self.p_nranks)]
+                arrays = self._extract_frames((first + self.p_id) * chunk,
+                                              counts[self.p_id])
+                gathered = {}
+                for key, shape, dtype in self._tseries_specs(sum(counts)):
+                    if self.p_id == 0:
+                        full = np.empty(shape, dtype=dtype)
+                    else:
+                        full = None
+                    gathered[key] = _mpi_gatherv(self.comm, arrays[key], full,
+                                                 counts)
+                if self.p_id != 0:
+                    continue
+                row = 0
+                for count in counts:
+                    if count:
+                        yield self._chunk_tseries(template, atgrps, dict(
+                                    (key, arr[row:row+count])
+                                    for key, arr in gathered.items()))
+                    row += count
+        elif not self.p_smp:
+            for chunk_id in range(nchunks):
+                arrays = self._extract_frames(chunk_id * chunk,
+                                              min(chunk,
+                                                  nframes - chunk_id * chunk))
+                yield self._chunk_tseries(template, atgrps, arrays)
+        else:
+            # Kept set while iterating: freshly forked workers pick it up
+            #  from us.
+            p_chunk = self.p_chunk
+            self.p_chunk = chunk
+            self.p_parms_set = False
+            try:
+                for arrays in self._get_pool().imap(
+                                    _parallel_chunk_extractor,
+                                    [(i,) for i in range(nchunks)],
+                                    self._p_state(extraction=True),
+                                    maxtasks=buffer):
+                    yield self._chunk_tseries(template, atgrps, arrays)
+            finally:
+                self.p_chunk = p_chunk
+
+        self._tseries = None
+        self.p_parms_set = False
+        if self.p_mpi and not self.p_mpi_keep_workers_alive and self.p_id != 0:
+            sys.exit(0)
+
+    def _extract_frames(self, first, nframes):
+        """Serially extracts mdreader._tseries over part of the frame range.
+
+        Returns the arrays in a dict, keyed as the Timeseries attributes.
+        """
+        saved = self._narrow_frames(first, nframes)
+        try:
+            self.parallel = False
+            if nframes:
+                self._extractor()
+                return dict((key, getattr(self._tseries, key))
+                            for key, shape, dtype in self._tseries_specs(0))
+            return dict((key, np.empty(shape, dtype=dtype))
+                        for key, shape, dtype in self._tseries_specs(0))
+        finally:
+            self.__dict__.update(saved)
+
+    def _chunk_tseries(self, template, atgrps, arrays):
+        """A new Timeseries like template, holding the given arrays."""
+        tseries = Timeseries()
+        for attr in ('_props', '_tjcdx_ndx', '_tjcdx_relndx', '_xyz',
+                     '_dtype', '_scale', '_compute', '_coords_istuple'):
+            setattr(tseries, attr, getattr(template, attr))
+        for key, arr in arrays.items():
+            setattr(tseries, key, arr)
+        tseries.atgrps = atgrps
+        return tseries
+
+    def _smp_extract(self, tseries, specs, out=None):
+        """Has the SMP workers extract tseries directly into shared arrays.
+
+        Unless out is set, in which case tseries._shared already holds the
+        output files, arrays for specs are allocated here.
+        """
+        if out is None and self.p_backend == 'threads':
+            tseries._shared = _LocalArrays(specs)
+        elif out is None:
+            tseries._shared = _SharedArrays(specs)
+        try:
+            if self.totalframes:
+                ntasks = (self._p_ntasks(overlap=0)
+                          if self.p_mode == 'dynamic' else self.p_num)
+                self._get_pool().map(_parallel_extractor,
+                                     [(i,) for i in range(ntasks)],
+                                     self._p_state(extraction=True),
+                                     callback=self._chunk_progress_cb(ntasks))
+            _set_shared_attrs(tseries)
+        finally:
+            tseries._shared.unlink()
+
+    def _prepare_tseries(self, coords, props, x, y, z, dtype=np.float32,
+                         scale=None, grouped=False, compute=None):
+        """Sets up mdreader._tseries for the extraction of coords and props.
+
+        Returns the list of AtomGroups to extract, and a rough estimate of the
+        memory needed per frame.
+        """
         self._tseries = Timeseries()
         tjcdx_atgrps = []
         mem = 0
-        if coords is None and props is None:
+        if coords is None and props is None and not compute:
             tjcdx_atgrps = [self.atoms]
         elif coords is not None:
             if isinstance(coords, mda.core.groups.AtomGroup):
@@ -1074,12 +3569,7 @@ class MDreader(mda.Universe):
                 self._tseries._coords_istuple = True
                 try:
                     for atgrp in coords:
-                        if isinstance(atgrp, numbers.Integral):
-                            tjcdx_atgrps.append(self.ndxgs[atgrp])
-                        elif isinstance(atgrp, mda.core.groups.AtomGroup):
-                            tjcdx_atgrps.append(atgrp)
-                        else:
-                            tjcdx_atgrps.append(self.select_atoms("%s" % atgrp))
+                        tjcdx_atgrps.append(self._as_atgrp(atgrp))
                 except:
                     raise TypeError("Error parsing coordinate groups.\n%r"
                                     % sys.exc_info()[1])
@@ -1089,15 +3579,49 @@ class MDreader(mda.Universe):
             # for each requested group.
             indices = [grp.indices for grp in tjcdx_atgrps]
             indices_len = [len(ndx) for ndx in indices]
-            (self._tseries._tjcdx_ndx,
-             self._tseries._tjcdx_relndx) = np.unique(np.concatenate(indices),
-                                                      return_inverse=True)
+            if grouped and self._tseries._coords_istuple:
+                # Each group a contiguous run, overlaps included.
+                self._tseries._tjcdx_ndx = np.concatenate(indices)
+                self._tseries._tjcdx_relndx = np.arange(
+                                                len(self._tseries._tjcdx_ndx))
+            else:
+                (self._tseries._tjcdx_ndx,
+                 self._tseries._tjcdx_relndx) = np.unique(
+                                                    np.concatenate(indices),
+                                                    return_inverse=True)
             self._tseries._tjcdx_relndx = np.split(self._tseries._tjcdx_relndx,
                                                    np.cumsum(indices_len[:-1])) 
 
             self._tseries._xyz = (x, y, z)
+            dtype = np.dtype(dtype)
+            if dtype.kind == 'i' and dtype.itemsize in (2, 4):
+                if scale is None:
+                    # From the first frame to extract, rather than whichever
+                    #  is current, so that it doesn't vary between runs (or
+                    #  MPI ranks).
+                    frame = self.trajectory.ts.frame
+                    if self.totalframes:
+                        self.trajectory[self.startframe]
+                    positions = self.atoms[self._tseries._tjcdx_ndx].positions
+                    extent = np.abs(positions).max(initial=0)
+                    if self.trajectory.ts.dimensions is not None:
+                        extent = max(extent,
+                                     self.trajectory.ts.dimensions[:3].max())
+                    if self.trajectory.ts.frame != frame:
+                        self.trajectory[frame]
+                    scale = 1000.
+                    if extent:
+                        scale = np.iinfo(dtype).max / (extent *
+                                                       (1 + _scale_margin))
+                check_positive(scale, strict=True)
+                self._tseries._scale = float(scale)
+            elif dtype not in (np.float32, np.float16):
+                raise_error(ValueError, "Coordinates can only be stored as "
+                            "float32, float16, int16 or int32, not %s."
+                            % dtype)
+            self._tseries._dtype = dtype.str
             mem = (self.atoms[self._tseries._tjcdx_ndx].positions[0].nbytes *
-                    sum(self._tseries._xyz))
+                    sum(self._tseries._xyz) * dtype.itemsize // 4)
 
         if props is not None:
             if isinstance(props, six.string_types):
@@ -1113,41 +3637,51 @@ class MDreader(mda.Universe):
                 mem += sys.getsizeof(getattr(self.trajectory.ts, attr))
                 setattr(self._tseries, attr, None)
 
-        mem *= len(self)
-
-        # This is potentially a lot of memory. Check it beforehand,
-        # except for MPI, which we trust the user to do themselves.
-        if not self.p_mpi:
-            avail_mem = memoryCheck()
-            if 2 * mem/(1024**2) > avail_mem.value:
-                raise_error(EnvironmentError,
-                            "You are attempting to read approximately %d MB of "
-                            "coordinates/values but your system only seems to "
-                            "have %d MB of physical memory (and we need at "
-                            "least twice as much memory as read bytes)."
-                            % (mem/(1024**2), avail_mem.value))
-
-        tseries = self._tseries
-        if not self.p_smp:
-            tseries = self._extractor()
-            if self.p_mpi:
-                tseries = self.comm.gather(tseries, root=0)
-                if self.p_id == 0:
-                    tseries = concat_tseries(tseries)
-        else:
-            pool = Pool(processes=self.p_num)
-            concat_tseries(pool.map(_parallel_extractor,
-                                    [(self, i) for i in range(self.p_num)]),
-                           tseries)
-
-        if self.p_mpi and not self.p_mpi_keep_workers_alive and self.p_id != 0:
-            sys.exit(0)
-        else:
-            self._tseries = None
-            tseries.atgrps = tjcdx_atgrps
-            self.p_parms_set = False
-            return tseries
-
+        if compute:
+            for name in sorted(compute):
+                try:
+                    kind, atgrp = compute[name]
+                    atgrp = self._as_atgrp(atgrp)
+                except:
+                    raise TypeError("Error parsing the group to compute '%s'."
+                                    "\n%r" % (name, sys.exc_info()[1]))
+                reduction = self._reduction(name, kind, atgrp, (x, y, z))
+                self._tseries._compute.append((name, reduction))
+                mem += int(np.prod(reduction.shape)) * 8
+                setattr(self._tseries, name, None)
+        return tjcdx_atgrps, mem
+
+    def _as_atgrp(self, atgrp):
+        """An AtomGroup, from an index group number, AtomGroup or selection."""
+        if isinstance(atgrp, numbers.Integral):
+            return self.ndxgs[atgrp]
+        elif isinstance(atgrp, mda.core.groups.AtomGroup):
+            return atgrp
+        return self.select_atoms("%s" % atgrp)
+
+    def _reduction(self, name, kind, atgrp, xyz):
+        """The _Reduction computing name's 'kind' quantity over atgrp."""
+        if (not isinstance(name, six.string_types) or name.startswith('_') or
+                name == 'atgrps' or hasattr(self._tseries, name)):
+            raise_error(ValueError, "Invalid name for a computed quantity: "
+                                    "%r." % (name,))
+        if kind not in ('cog', 'com', 'per_residue_cog', 'per_residue_com'):
+            raise_error(ValueError, "Unknown quantity to compute: %r. Must "
+                        "be one of 'cog', 'com', 'per_residue_cog' or "
+                        "'per_residue_com'." % (kind,))
+        if not len(atgrp):
+            raise_error(ValueError, "Can't compute '%s' over an empty group."
+                                    % name)
+        weights = segments = None
+        if kind.endswith('com'):
+            try:
+                weights = atgrp.masses
+            except mda.exceptions.NoDataError:
+                raise_error(ValueError, "Can't compute '%s': the topology "
+                                        "has no atom masses." % name)
+        if kind.startswith('per_residue'):
+            segments = atgrp.resindices
+        return _Reduction(atgrp.indices, xyz, weights, segments)
 
     def do_in_parallel(self, fn, *args, **kwargs):
         """ Applies fn to every frame, taking care of parallelization details.
@@ -1162,20 +3696,58 @@ class MDreader(mda.Universe):
         ret_type can be set to "last_per_worker" to specify that only the last
             frame result per worker be returned. This is useful when dealing
             with returned objects that are updated along the several frames.
+        out can be set to a .npy file name, to which the per-frame results,
+            which must then be same-shaped arrays (or scalars), are written
+            directly by each worker or MPI rank. fn is called once beforehand
+            in the parent, on the first frame, to find out the shape and dtype
+            of its results. The returned value is then the array of results,
+            backed by that file, instead of a list.
+        ret_type can also be set to "reduce", in which case the per-frame
+            results are folded inside each worker as
+            partial = reduce_fn(partial, result), starting from reduce_init,
+            and only the single merged result is returned. Partials from
+            different workers (or chunks, or MPI ranks) are merged in frame
+            order with the same reduce_fn, which must therefore be
+            associative and accept partials as well as per-frame results
+            (and also commutative in 'interleaved' mode). reduce_init should
+            be an identity value for reduce_fn (a zero-filled histogram, for
+            instance); each worker starts from its own copy of it. Under MPI
+            partials are merged over a binary tree of ranks.
+        fn can get at the frame being worked on through
+            mdreader.current_reader(), the reader calling it (in parallel
+            workers, the worker's own reader), or through AtomGroup
+            arguments, which are always those of that reader. fn can be a
+            lambda or closure: persistent workers get it, along with the
+            script globals it uses, without being restarted (the reader and
+            its AtomGroups among those again standing for the worker's own).
         Refer to the documentation on MDreader.iterate() for information on
         which MDreader attributes to set to change default parallelization
         options.
 
         """
         self.p_fn = fn
+        _current.reader = self
         
         try:
             ret_type = kwargs.pop("ret_type")
-            if ret_type not in ("normal", "last_per_worker"):
+            if ret_type not in ("normal", "last_per_worker", "reduce"):
                 raise ValueError("'ret_type' must be one of 'normal', "
-                                 "'last_per_worker'")
+                                 "'last_per_worker', 'reduce'")
         except KeyError:
             ret_type = "normal"
+        if ret_type == "reduce":
+            try:
+                self.p_reduce = (kwargs.pop("reduce_init"),
+                                 kwargs.pop("reduce_fn"))
+            except KeyError:
+                raise ValueError("ret_type 'reduce' requires both the "
+                                 "'reduce_init' and 'reduce_fn' arguments.")
+        else:
+            self.p_reduce = None
+        out = kwargs.pop("out", None)
+        self._p_out = None
+        if out is not None and ret_type != "normal":
+            raise ValueError("'out' can only be used with ret_type 'normal'.")
 
         try:
             parallel = kwargs.pop("parallel")
@@ -1191,59 +3763,279 @@ class MDreader(mda.Universe):
         self.ensure_parsed()
         if force_p_recheck:
             self.set_parallel_parms(nprocs)
+        if out is not None:
+            return self._do_in_parallel_npy(out)
 
+        if self.p_mpi and self.p_smp:
+            return self._do_in_parallel_hybrid(ret_type)
         if not self.p_smp:
             if not self.p_mpi:
                 if ret_type == "normal":
                     return self._reader()
+                elif ret_type == "reduce":
+                    return _merge_partials([self._reader()], *self.p_reduce)
                 else:  # Last frame result only
                     return self._reader()[-1]
+            elif ret_type == "reduce":
+                res = _mpi_tree_reduce(self.comm, self._reader(),
+                                       self.p_reduce[1])
+                if not (self.p_id == 0 or self.p_mpi_keep_workers_alive):
+                    sys.exit(0)
+                if self.p_id == 0:
+                    return _merge_partials([res], *self.p_reduce)
+                return None
             else:
                 res = self._reader()
+                if ret_type == "normal" and self.p_mode != "interleaved":
+                    # Same-shaped array results travel as raw buffers.
+                    gathered, arrs = self._mpi_gather_arrays(res)
+                    if gathered:
+                        if not (self.p_id == 0 or
+                                self.p_mpi_keep_workers_alive):
+                            sys.exit(0)
+                        return list(arrs) if self.p_id == 0 else None
                 res = self.comm.gather(res, root=0)
                 if not (self.p_id == 0 or self.p_mpi_keep_workers_alive):
                     sys.exit(0)
+                if self.p_id == 0:
+                    return self._unravel(res, ret_type)
         else:
-            pool = Pool(processes=self.p_num)
-            res = pool.map(_parallel_launcher,
-                           [(self, i) for i in range(self.p_num)]) 
+            return self._smp_results(ret_type)
 
-        # 1-level unravelling and de-interlacing
-        if self.p_smp or (self.p_mpi and self.p_id == 0):
-            if self.p_mode == "block":
-                if ret_type == "normal":
-                    return [val for subl in res for val in subl] 
-                else:   # Last frame result only
-                    return [subl[-1] for subl in res] 
-            elif self.p_mode == "interleaved":
-                if ret_type == "normal":
-                    ret = []
-                    for ctr in range(len(res[0])):
-                        for subl in res:
-                            try:
-                                ret.append(subl[ctr])
-                            except IndexError:
-                                pass
-                    return ret
-                else:  # Last frame result only. In order.
-                    ret = [subl[-1] for subl in res if len(subl) < len(res[0])]
-                    ret2 = [subl[-1] for subl in res if len(subl) == len(res[0])]
-                    return ret + ret2
+    def _smp_map(self, launcher, overlap=None):
+        """ Runs launcher over the SMP pool, one task per block or chunk.
+
+        """
+        if self.p_mode == "dynamic":
+            ntasks = self._p_ntasks(overlap=overlap)
+        else:
+            ntasks = self.p_num
+        return self._get_pool().map(launcher, [(i,) for i in range(ntasks)],
+                                    self._p_state(),
+                                    callback=self._chunk_progress_cb(ntasks))
+
+    def _smp_results(self, ret_type):
+        """ The SMP part of do_in_parallel. Returns results in frame order.
+
+        """
+        if self.p_mode == "dynamic":
+            res = self._smp_map(_parallel_chunk_launcher)
+            if ret_type == "reduce":
+                return _merge_partials([subl for pid, subl in res],
+                                       *self.p_reduce)
+            elif ret_type == "normal":
+                return [val for pid, subl in res for val in subl]
+            else:   # Last frame result per worker, in order of the chunks.
+                lasts = {}
+                for chunk_id, (pid, subl) in enumerate(res):
+                    if subl:
+                        lasts[pid] = (chunk_id, subl[-1])
+                return [val for chunk_id, val in sorted(lasts.values(),
+                                                        key=lambda x: x[0])]
+        res = self._smp_map(_parallel_launcher)
+        if ret_type == "reduce":
+            return _merge_partials(res, *self.p_reduce)
+        return self._unravel(res, ret_type)
+
+    def _unravel(self, res, ret_type):
+        """ 1-level unravelling and de-interlacing of per-worker results.
+
+        """
+        # Under MPI dynamic mode falls back to blocks.
+        if self.p_mode in ("block", "dynamic"):
+            if ret_type == "normal":
+                return [val for subl in res for val in subl] 
+            else:   # Last frame result only
+                return [subl[-1] for subl in res if subl] 
+        elif self.p_mode == "interleaved":
+            if ret_type == "normal":
+                ret = []
+                for ctr in range(len(res[0])):
+                    for subl in res:
+                        try:
+                            ret.append(subl[ctr])
+                        except IndexError:
+                            pass
+                return ret
+            else:  # Last frame result only. In order.
+                ret = [subl[-1] for subl in res if len(subl) < len(res[0])
+                       and subl]
+                ret2 = [subl[-1] for subl in res if len(subl) == len(res[0])
+                        and subl]
+                return ret + ret2
+        else:
+            raise NotImplementedError("Unknown parallelization mode '%s'"
+                                      % self.p_mode)
+
+    def _do_in_parallel_hybrid(self, ret_type):
+        """ do_in_parallel over MPI ranks, each with its own SMP workers.
+
+        """
+        saved = self._narrow_to_rank(self.p_overlap)
+        try:
+            if self.totalframes:
+                local = self._smp_results(ret_type)
+            elif ret_type == "reduce":
+                local = copy.deepcopy(self.p_reduce[0])
             else:
-                raise NotImplementedError("Unknown parallelization mode '%s'"
-                                          % self.p_mode)
+                local = []
+        finally:
+            self.__dict__.update(saved)
+
+        if ret_type == "reduce":
+            res = _mpi_tree_reduce(self.comm, [local], self.p_reduce[1])
+        else:
+            gathered = False
+            if ret_type == "normal":
+                gathered, res = self._mpi_gather_arrays(local)
+            if not gathered:
+                res = self.comm.gather(local, root=0)
+        if not (self.p_id == 0 or self.p_mpi_keep_workers_alive):
+            sys.exit(0)
+        if self.p_id != 0:
+            return None
+        if ret_type == "reduce":
+            return res[0]
+        elif gathered:
+            return list(res)
+        return [val for subl in res for val in subl]
+
+    def iter_parallel(self, fn, *args, **kwargs):
+        """ Lazily yields fn's result for every frame, in trajectory order.
+
+        Works as do_in_parallel, but results are yielded as soon as the
+        workers produce them (and all previous frames have been yielded),
+        instead of being returned in a list at the end. Frames are split into
+        small chunks as in MDreader.p_mode='dynamic' (MDreader.p_chunk sets
+        their size). Only a bounded number of chunks are in flight at any
+        time, which can be set with the 'buffer' keyword (default: twice the
+        number of workers). Breaking out of the loop stops the scheduling of
+        new chunks.
+        'parallel' has the same meaning as for do_in_parallel. Under MPI,
+        results are only yielded on the root rank, and only after all ranks
+        are done.
+
+        Example:
+        for angles in mdreader.iter_parallel(calc_frame_angles):
+            outfile.write(...)
+
+        """
+        buffer = kwargs.pop("buffer", None)
+        self.p_reduce = None
+        self._p_out = None
+        try:
+            parallel = kwargs.pop("parallel")
+        except KeyError:
+            force_p_recheck = False
+        else:
+            nprocs = int(not parallel)
+            force_p_recheck = True
+
+        self.ensure_parsed()
+        if force_p_recheck:
+            self.set_parallel_parms(nprocs)
+        elif not self.p_parms_set:
+            self.set_parallel_parms()
+
+        if self.p_mpi:
+            kwargs["parallel"] = True
+            for val in self.do_in_parallel(fn, *args, **kwargs) or []:
+                yield val
+        elif not self.p_smp:
+            self.p_fn = fn
+            for frame in self.iterate():
+                result = fn(*args, **kwargs)
+                if not self.i_overlap:
+                    yield result
+        else:
+            self.p_fn = fn
+            self.p_args = args
+            self.p_kwargs = kwargs
+            ntasks = self._p_ntasks()
+            self.p_parms_set = False
+            for subl in self._get_pool().imap(_parallel_stream_launcher,
+                                              [(i,) for i in range(ntasks)],
+                                              self._p_state(),
+                                              maxtasks=buffer):
+                for val in subl:
+                    yield val
+
+    def _do_in_parallel_npy(self, out):
+        """ do_in_parallel, with results written directly to a .npy file.
+
+        """
+        if not self.p_parms_set:
+            self.set_parallel_parms()
+        if self.p_overlap and self.p_mode == "interleaved":
+            raise ValueError("p_overlap can't be used in 'interleaved' mode "
+                             "when writing results to 'out'.")
+        # Probe the result shape/dtype on the first non-overlapping frame.
+        self.trajectory[self.startframe + self.p_overlap * self.opts.skip]
+        probe = np.asarray(self.p_fn(*self.p_args, **self.p_kwargs))
+        specs = [('_res', (self.totalframes - self.p_overlap,) + probe.shape,
+                  probe.dtype)]
+        self._p_out = self._npy_out(specs, out, main='_res')
+        try:
+            if self.p_mpi and self.p_smp:
+                saved = self._narrow_to_rank(self.p_overlap)
+                try:
+                    if self.totalframes:
+                        self._smp_map(_parallel_launcher)
+                finally:
+                    self.__dict__.update(saved)
+                self.comm.Barrier()
+            elif self.p_smp:
+                self._smp_map(_parallel_launcher)
+            else:
+                self._reader()
+                if self.p_mpi:
+                    self.comm.Barrier()
+            if self.p_mpi and self.p_id != 0:
+                if not self.p_mpi_keep_workers_alive:
+                    sys.exit(0)
+                return None
+            return self._p_out.arrays()['_res']
+        finally:
+            self._p_out = None
+            self.p_parms_set = False
+
+    def _mpi_gather_arrays(self, res):
+        """ Buffer-gathers, in rank order, per-frame array results from _reader.
+
+        Only possible if all ranks' results are arrays of the same shape and
+        (non-object) dtype. Returns a (gathered, array) tuple; if gathered is
+        False nothing was done and results must be gathered as objects. The
+        array has the stacked results on rank 0, and is None elsewhere.
+        """
+        sig = None
+        if res:
+            sig = False
+            if all(isinstance(val, np.ndarray) for val in res):
+                sig = (res[0].shape, res[0].dtype.str)
+                if res[0].dtype.hasobject or any((val.shape, val.dtype.str)
+                                                 != sig for val in res):
+                    sig = False
+        info = self.comm.allgather((len(res), sig))
+        sigs = set(rank_sig for nres, rank_sig in info if nres)
+        if len(sigs) != 1 or False in sigs:
+            return False, None
+        shape, dtype = sigs.pop()
+        if res:
+            local = np.stack(res)
+        else:
+            local = np.empty((0,) + shape, dtype=dtype)
+        counts = [nres for nres, rank_sig in info]
+        full = None
+        if self.p_id == 0:
+            full = np.empty((sum(counts),) + shape, dtype=dtype)
+        return True, _mpi_gatherv(self.comm, local, full, counts)
 
     def _reader(self):
         """ Applies self.p_fn for every trajectory frame. Parallelizable!
 
         """
-        if self.p_smp:
-        # We need a brand new file descriptor per SMP worker, otherwise we
-        # have a nice chaos.
-        # This must be the first thing after entering parallel land.
-            self._reopen_traj()
-
         reslist = []
+        _current.reader = self
         if not self.i_parms_set:
             self._set_iterparms()
         if self.i_unemployed: # This little piggy stays home
@@ -1251,6 +4043,27 @@ class MDreader(mda.Universe):
             self.p_parms_set = False
             return reslist
 
+        if self._p_out is not None:
+            # Results go straight to their rows in the output file.
+            res_out = self._p_out.arrays()['_res']
+            for frame in self.iterate():
+                result = self.p_fn(*self.p_args, **self.p_kwargs)
+                if not self.i_overlap:
+                    res_out[(self.i_startframe + self.iterframe * self.i_skip
+                             - self.startframe) // self.opts.skip
+                            - self.p_overlap + self._row_offset] = result
+            return reslist
+
+        if self.p_reduce is not None:
+            # Fold as we go; the partial is returned as a 1-element list.
+            partial = copy.deepcopy(self.p_reduce[0])
+            reduce_fn = self.p_reduce[1]
+            for frame in self.iterate():
+                result = self.p_fn(*self.p_args, **self.p_kwargs)
+                if not self.i_overlap:
+                    partial = reduce_fn(partial, result)
+            return [partial]
+
         for frame in self.iterate():
             result = self.p_fn(*self.p_args, **self.p_kwargs)
             if not self.i_overlap:
@@ -1264,68 +4077,166 @@ class MDreader(mda.Universe):
         # TODO: This should become a function to pass to _reader... Lots of code
         # duplication between these two.
 
-        if self.p_smp:
-        # We need a brand new file descriptor per SMP worker, otherwise we
-        # have a nice chaos.
-        # This must be the first thing after entering parallel land.
-            self._reopen_traj()
-
         if not self.i_parms_set:
             self._set_iterparms()
 
+        if self._tseries._shared is None:
+            arrays = dict((key, np.empty(shape, dtype=dtype)) for
+                          key, shape, dtype in
+                          self._tseries_specs(self.i_totalframes))
+            offset = 0
+        else:
+            # Parallel extraction into arrays preallocated by the parent.
+            arrays = self._tseries._shared.arrays()
+            offset = ((self.i_startframe - self.startframe) // self.opts.skip
+                      + self._row_offset)
+        cdx = arrays.get('_cdx')
+        if cdx is not None:
+            extract = _ExtractionPlan(self._tseries._tjcdx_ndx,
+                                      self._tseries._xyz, cdx.dtype,
+                                      self._tseries._scale)
+
+        if not self.i_unemployed:
+            for frame in self.iterate():
+                if cdx is not None:
+                    extract(self.trajectory.ts.positions,
+                            cdx[offset + self.iterframe])
+                for attr in self._tseries._props:
+                    arrays[attr][offset + self.iterframe,
+                                 ...] = getattr(self.trajectory.ts, attr)
+                for name, reduction in self._tseries._compute:
+                    reduction(self.trajectory.ts.positions,
+                              arrays[name][offset + self.iterframe])
+        if self._tseries._shared is not None:
+            # Nothing to send back.
+            return None
+        for key, arr in arrays.items():
+            setattr(self._tseries, key, arr)
+        return self._tseries
+
+    def _tseries_specs(self, nframes):
+        """(key, shape, dtype) of the arrays to extract into mdreader._tseries.
+
+        """
+        specs = []
         if len(self._tseries._tjcdx_ndx):
-            self._tseries._cdx = np.empty((self.i_totalframes,
-                                          len(self._tseries._tjcdx_ndx),
-                                          sum(self._tseries._xyz)),
-                                          dtype=np.float32)
+            specs.append(('_cdx', (nframes, len(self._tseries._tjcdx_ndx),
+                                   sum(self._tseries._xyz)),
+                          self._tseries._dtype))
         for attr in self._tseries._props:
+            val = getattr(self.trajectory.ts, attr)
             try:
-                shape = ((self.i_totalframes,) +
-                         getattr(self.trajectory.ts, attr).shape)
+                shape = (nframes,) + val.shape
             except AttributeError:
-                shape = (self.i_totalframes,)
+                shape = (nframes,)
             try:
-                setattr(self._tseries, attr,
-                        np.empty(shape,
-                                 dtype=(getattr(self.trajectory.ts,
-                                                attr)).dtype))
+                dtype = val.dtype
             except AttributeError:
-                setattr(self._tseries, attr,
-                        np.empty(shape,
-                                 dtype=type(getattr(self.trajectory.ts, attr))))
-
-        if not self.i_unemployed:
-            for frame in self.iterate():
-                if self._tseries._cdx is not None:
-                    self._tseries._cdx[self.iterframe] = self.atoms[
-                            self._tseries._tjcdx_ndx
-                            ].positions[:, np.where(self._tseries._xyz)[0]]
-                for attr in self._tseries._props:
-                    getattr(self._tseries, attr)[self.iterframe,
-                                            ...] = getattr(self.trajectory.ts,
-                                                           attr)
-        return self._tseries
+                dtype = type(val)
+            specs.append((attr, shape, dtype))
+        for name, reduction in self._tseries._compute:
+            specs.append((name, (nframes,) + reduction.shape, np.float64))
+        return specs
     
+    def _spill_file(self):
+        """A new file name for timeseries that won't fit in memory."""
+        if self.tseries_spill is True:
+            dirname = tempfile.gettempdir()
+        else:
+            dirname = self.tseries_spill
+        fd, fname = tempfile.mkstemp(prefix='mdreader_spill_', suffix='.npy',
+                                     dir=dirname)
+        os.close(fd)
+        return fname
+
+    def _cache_dir(self, cache):
+        """The timeseries cache directory, per the 'cache' argument."""
+        if cache is not True:
+            return cache
+        dirname = os.path.dirname(os.path.abspath(self._trajfiles()[0]))
+        if not os.access(dirname, os.W_OK):
+            dirname = tempfile.gettempdir()
+        return os.path.join(dirname, '.mdreader_cache')
+
+    def _get_pool(self):
+        """Returns the persistent SMP worker pool, (re)creating it as needed.
+        """
+        if self.p_backend == 'threads':
+            pool_cls = ThreadPool
+        elif self.p_backend == 'processes':
+            pool_cls = Pool
+        else:
+            raise ValueError("Unrecognized p_backend \"%r\"" % self.p_backend)
+        if self._pool is not None and (self._pool.nprocs != self.p_num or
+                                       type(self._pool) is not pool_cls):
+            self._pool.close()
+            self._pool = None
+        if self._pool is None:
+            self._pool = pool_cls(processes=self.p_num, rdr=self)
+        return self._pool
+
+    def _worker_spec(self):
+        """A compact description from which workers can rebuild the reader.
+        """
+        self.ensure_parsed()
+        return _WorkerSpec(self)
+
+    def _npy_out(self, specs, path, main='_cdx', temporary=False):
+        """Creates (on rank 0, under MPI) .npy output files for workers."""
+        npy = _NpyArrays(specs, path, main=main, create=not self.p_id,
+                         temporary=temporary)
+        if self.p_mpi:
+            self.comm.Barrier()
+        return npy
+
+    def _thread_copy(self):
+        """A shallow copy of the reader, for use by a worker thread."""
+        # Bypass __new__, which would create yet another class.
+        rdr = object.__new__(type(self))
+        rdr.__dict__.update(self.__dict__)
+        return rdr
+
+    def _clone_traj(self):
+        """Returns an independent reader of the trajectory."""
+        return _clone_reader(self.trajectory)
+
+    def _p_state(self, extraction=False):
+        """The reader attributes to refresh in already running pool workers.
+
+        Extraction calls leave out the per-frame function and its arguments,
+        which they don't use, and which may well not be picklable.
+        """
+        state = dict((attr, self.__dict__[attr]) for attr in _p_state_attrs
+                     if attr in self.__dict__ and
+                        not (extraction and attr in _p_fn_attrs))
+        if self.p_time_blocks and self.hastime and self.p_mode == 'block':
+            # Workers cut their blocks from the frame times, which we get
+            #  only once, here.
+            state['_frame_times'] = self.frame_times
+        return state
+
     def _reopen_traj(self):
-       # Let's make this generic and always loop over a list of formats. If
-       # it's the ChainReader then they all get in.
-       rdrs = []
-       if self.trajectory.format == "CHAIN":
-           rdrs.extend(self.trajectory.readers)
-       else:
-           rdrs.append(self.trajectory)
-       for rdr in rdrs:
-           # XTC/TRR reader has this method, but not all formats...
-           if hasattr(rdr, "_reopen"):
-               rdr._reopen()
-           elif hasattr(rdr, "dcdfile"):
-               rdr.dcdfile.close()
-               rdr.dcdfile = open(self.trajectory.filename, 'rb')
-           else:
-               raise_error(AttributeError,
-                           "Don't know how to get a new file descriptor for "
-                           "the %s trajectory format. You'll have to skip "
-                           "parallelization." % rdr.format)
+        """Replaces the trajectory reader by an independent clone.
+
+        Meant for forked workers, which otherwise share file positions with
+        the parent. The inherited file handles are closed, which only
+        affects this process.
+        """
+        traj = self.trajectory
+        self.trajectory = _clone_reader(traj)
+        traj.close()
+
+    def _first_time(self):
+        """The time of the first frame, reading only that frame."""
+        if self._frame_times is not None:
+            return self._frame_times[0]
+        frame = self.trajectory.ts.frame
+        if frame:
+            self.trajectory[0]
+        t0 = self.trajectory.ts.time
+        if frame:
+            self.trajectory[frame]
+        return t0
 
     def _set_frameparms(self):
         if self.opts.asframenum:
@@ -1342,40 +4253,53 @@ class MDreader(mda.Universe):
                 self._endframe = self.nframes + self.opts.starttime
             else:
                 self._endframe = min(self.nframes-1, self.opts.endtime)
+        elif ((self.opts.starttime is None or
+               0. <= self.opts.starttime <= self._first_time()) and
+              (self.opts.endtime is None or self.opts.endtime is INF)):
+            # No effective time limits (SimpleReader passes b=0, for
+            #  instance): no need to get the frame times.
+            self._startframe = 0
+            self._endframe = self.nframes-1
         else:
-            # We bend over backwards here with np.rint to ensure the correct
-            # int ceil (python 2.7 doesn't have it yet).
-            t0 = self.trajectory[0].time
+            # Frames are found by binary search over their times; each limit
+            # maps to the first frame at or after it.
+            times = self.frame_times
+            t0 = times[0]
+            steps = np.diff(times)
+            steps = steps[steps > 0]
+            # Times are often stored in single precision. Anything closer
+            # than this is the same time.
+            tol = 1e-4 * np.median(steps) if len(steps) else 1e-7
+            # Negative limits count back from one frame step past the end.
+            tend = times[-1] + (times[-1] - times[-2] if len(times) > 1 else 0.)
             if self.opts.starttime is None:
                 self._startframe = 0
             elif self.opts.starttime < 0.:
-                self._startframe = self.nframes + int(
-                        math.ceil(self.opts.starttime / self.trajectory.dt)) 
-            elif t0 - self.opts.starttime > 1e-7:
+                self._startframe = int(np.searchsorted(
+                        times, tend + self.opts.starttime - tol))
+            elif t0 - self.opts.starttime > tol:
                 raise_error(ValueError,
                             "You requested to start at time %f but the "
                             "trajectory starts already at time %f."
                             % (self.opts.starttime, t0))
             else:
-                self._startframe = int(np.rint(math.ceil(
-                                         (self.opts.starttime - t0) /
-                                         self.trajectory.dt)))
+                self._startframe = int(np.searchsorted(
+                        times, self.opts.starttime - tol))
 
             if self.opts.endtime is None or self.opts.endtime is INF:
                 self._endframe = self.nframes-1
             elif self.opts.endtime < 0.:
-                self._endframe = self.nframes + int(math.ceil(
-                                                      self.opts.endtime /
-                                                      self.trajectory.dt)) 
-            elif t0 - self.opts.endtime > 1e-7:
+                self._endframe = min(int(np.searchsorted(
+                        times, tend + self.opts.endtime - tol)),
+                                     self.nframes - 1)
+            elif t0 - self.opts.endtime > tol:
                 raise_error(ValueError,
                             "Specified end time lower (%f ps) than the "
                             "trajectory start time (%f ps)."
                             % (self.opts.endtime, t0))
             else:
-                self._endframe = min(int(np.rint(math.ceil(
-                                           (self.opts.endtime - t0) /
-                                           self.trajectory.dt))),
+                self._endframe = min(int(np.searchsorted(
+                        times, self.opts.endtime - tol)),
                                      self.nframes - 1)
 
         if self._startframe >= self.nframes:
@@ -1425,17 +4349,28 @@ class MDreader(mda.Universe):
                 self.i_endframe = int(self.i_startframe +
                                       int(frames_per_worker[self.p_id] - 1) *
                                       self.i_skip)
-            elif self.p_mode == "block":
+            elif self.p_mode == "dynamic" and self.p_smp:
+                # Here p_id is the chunk number. All chunks but the first
+                # start p_overlap frames earlier; they overlap into the
+                # previous chunk's frames.
+                chunk = self._p_chunksize()
+                nreal = self.totalframes - self.p_overlap
+                self.i_skip = self.opts.skip
+                frames_per_worker = {self.p_id: max(0, min(chunk, nreal -
+                                                    self.p_id * chunk))}
+                self.i_startframe = int(self.startframe +
+                                        self.p_id * chunk * self.i_skip)
+                self.i_endframe = int(self.i_startframe +
+                                      (frames_per_worker[self.p_id] +
+                                       self.p_overlap - 1) * self.i_skip)
+                if not self.p_id:
+                    # The first chunk works on its overlap frames too.
+                    frames_per_worker[0] += self.p_overlap
+            elif self.p_mode in ("block", "dynamic"):
                 # As-even-as-possible distribution of frames per workers,
                 # allowing the first one to work more to compensate the lack
                 # of overlap.
-                frames_per_worker = (np.ones(self.p_num, dtype=int) *
-                                     ((self.totalframes-self.p_overlap) //
-                                      self.p_num))
-                frames_per_worker[:(self.totalframes-self.p_overlap) %
-                                  self.p_num] += 1 
-                # Add extra overlap frames to the first worker.
-                frames_per_worker[0] += self.p_overlap
+                frames_per_worker = self._block_frames()
                 self.i_skip = self.opts.skip
                 self.i_startframe = int(self.startframe +
                                         np.sum(frames_per_worker[:self.p_id]) *
@@ -1462,6 +4397,161 @@ class MDreader(mda.Universe):
         self.i_parms_set = True
 
 
+    def _block_frames(self, nworkers=None, overlap=None):
+        """Number of frames each worker iterates over, in 'block' mode."""
+        if nworkers is None:
+            nworkers = self.p_num
+        if overlap is None:
+            overlap = self.p_overlap
+        frames_per_worker = None
+        if self.p_time_blocks and self.hastime:
+            frames_per_worker = self._time_blocks(nworkers, overlap)
+        elif self.p_align_files:
+            frames_per_worker = self._file_blocks(nworkers, overlap)
+        if frames_per_worker is None:
+            # As-even-as-possible distribution of frames per workers,
+            # allowing the first one to work more to compensate the lack
+            # of overlap.
+            frames_per_worker = (np.ones(nworkers, dtype=int) *
+                                 ((self.totalframes-overlap) // nworkers))
+            frames_per_worker[:(self.totalframes-overlap) % nworkers] += 1 
+        # Add extra overlap frames to the first worker.
+        frames_per_worker[0] += overlap
+        return frames_per_worker
+
+    def _time_blocks(self, nworkers, overlap):
+        """Non-overlap frames per worker, for blocks spanning equal times.
+
+        Blocks are cut over the frames' times, which doesn't read frames.
+        """
+        frames = self.startframe + np.arange(overlap, self.totalframes,
+                                             dtype=np.int64) * self.opts.skip
+        times = self.frame_times[frames]
+        if not len(times):
+            return np.zeros(nworkers, dtype=int)
+        targets = times[0] + ((times[-1] - times[0]) *
+                              np.arange(1, nworkers) / nworkers)
+        cuts = np.searchsorted(times, targets)
+        return np.diff(np.concatenate(([0], cuts, [len(times)]))).astype(int)
+
+    def _file_bounds(self, overlap):
+        """Where, in the non-overlap frames, each new trajectory file starts.
+        """
+        if self.trajectory.format != "CHAIN":
+            return []
+        nreal = self.totalframes - overlap
+        firsts = np.cumsum([rdr.n_frames for rdr in self.trajectory.readers])
+        # Number of the first frame of each file, in our frame range.
+        bounds = -(-(firsts[:-1] - self.startframe) // self.opts.skip) - overlap
+        return sorted(set(int(bound) for bound in bounds
+                          if 0 < bound < nreal))
+
+    def _file_blocks(self, nworkers, overlap):
+        """Non-overlap frames per worker, for blocks aligned to trajectory files.
+
+        Returns None if the frame range doesn't span several files.
+        """
+        bounds = self._file_bounds(overlap)
+        if not bounds:
+            return None
+        nreal = self.totalframes - overlap
+        edges = np.array([0] + bounds + [nreal])
+        sizes = np.diff(edges)
+        if nworkers >= len(sizes):
+            # Each file gets its own workers, one each to begin with. Extra
+            #  ones go, one by one, where the load is highest.
+            nworkers_file = np.ones(len(sizes), dtype=int)
+            for i in range(nworkers - len(sizes)):
+                nworkers_file[np.argmax(sizes / nworkers_file)] += 1
+            if (np.max(-(-sizes // nworkers_file)) <=
+                    (1 + _align_slack) * nreal / nworkers):
+                frames_per_worker = []
+                for size, nfile in zip(sizes, nworkers_file):
+                    frames_per_worker.extend([size // nfile + 1] *
+                                             (size % nfile) +
+                                             [size // nfile] *
+                                             (nfile - size % nfile))
+                return np.array(frames_per_worker, dtype=int)
+        # Otherwise, each cut goes to the file boundary closest to an even
+        #  split of the remaining frames, if there's one close enough.
+        frames_per_worker = []
+        start = 0
+        for nleft in range(nworkers, 1, -1):
+            share = (nreal - start) / nleft
+            near = edges[(edges > start) &
+                         (np.abs(edges - (start + share)) <=
+                          _align_slack * share)]
+            if len(near):
+                cut = near[np.argmin(np.abs(near - (start + share)))]
+            else:
+                cut = start + int(round(share))
+            frames_per_worker.append(cut - start)
+            start = cut
+        frames_per_worker.append(nreal - start)
+        return np.array(frames_per_worker, dtype=int)
+
+    def _narrow_to_rank(self, overlap):
+        """Restricts the frame range to this rank's block, for hybrid runs.
+
+        The rank's local SMP workers then split that block further, as if
+        it were the whole trajectory. Returns the attributes to restore
+        afterwards.
+        """
+        frames = self._block_frames(self.p_nranks, overlap)
+        before = int(np.sum(frames[:self.p_id]))
+        nframes = int(frames[self.p_id])
+        if self.p_id:
+            # Ranks but the first also read the overlap frames before them.
+            before -= overlap
+            nframes += overlap
+        return self._narrow_frames(before, nframes)
+
+    def _narrow_frames(self, first, nframes):
+        """Restricts the frame range to nframes frames, from row 'first' on.
+
+        Returns the attributes to restore afterwards.
+        """
+        saved = dict((attr, self.__dict__[attr]) for attr in
+                     ('_startframe', '_endframe', '_totalframes', 'p_mpi',
+                      'parallel', '_row_offset'))
+        self._startframe = self.startframe + first * self.opts.skip
+        self._endframe = self._startframe + (nframes - 1) * self.opts.skip
+        self._totalframes = nframes
+        # Output rows that precede these.
+        self._row_offset = first
+        # Local workers mustn't try to talk MPI.
+        self.p_mpi = False
+        return saved
+
+    def _p_chunksize(self, overlap=None):
+        """Number of frames per chunk in 'dynamic' parallel mode."""
+        if self.p_chunk:
+            return int(self.p_chunk)
+        if overlap is None:
+            overlap = self.p_overlap
+        # A few chunks per worker balance load without too much overhead.
+        return max(1, -(-(self.totalframes - overlap) // (4 * self.p_num)))
+
+    def _p_ntasks(self, overlap=None):
+        """Number of chunks to split the frames into in 'dynamic' mode."""
+        if overlap is None:
+            overlap = self.p_overlap
+        return max(1, -(-(self.totalframes - overlap) //
+                        self._p_chunksize(overlap)))
+
+    def _chunk_progress_cb(self, ntasks):
+        """Progress output function for the parent in 'dynamic' mode."""
+        if not (self.opts.verbose and self.p_mode == 'dynamic') or self.p_id:
+            return None
+        sys.stderr.write("Iterating through trajectory...\n")
+        def _progress(ndone):
+            sys.stderr.write("\033[K%3.0f%% (%d of %d chunks)\r"
+                             % (100. * ndone / ntasks, ndone, ntasks))
+            if ndone == ntasks:
+                sys.stderr.write("\n")
+            sys.stderr.flush()
+        return _progress
+
     def set_parallel_parms(self, nprocs=None):
         """Resets parallelization parameters
 
@@ -1470,6 +4560,11 @@ class MDreader(mda.Universe):
           OS-reported number, and 1 sets up serial iteration. If nprocs is left
           at None, then the last used number of processors will be re-used
           (behaving like nprocs=0 if not yet set).
+        Under MPI the number of workers is set by mpirun instead. If
+        MDreader.p_num_local is greater than 1 (it's set by the -np option
+        under MPI) each MPI rank further splits its work among that many
+        local SMP workers. This hybrid mode is best used with one rank per
+        node, so that the topology is only loaded once per node.
         """
         if self.p_num is None or nprocs is not None:
             self.p_num = nprocs
@@ -1480,7 +4575,13 @@ class MDreader(mda.Universe):
             if self.p_mpi:
                 # MPI size always overrides manually set p_num.
                 # The user controls the pool size with mpirun -np nprocs
-                self.p_num = self.comm.Get_size()
+                self.p_nranks = self.comm.Get_size()
+                self.p_num = self.p_nranks
+                if self.p_num_local and self.p_num_local > 1:
+                    # Hybrid: each rank's block is further split among
+                    #  local SMP workers.
+                    self.p_smp = True
+                    self.p_num = self.p_num_local
             elif self.p_smp and not self.p_num:
                 self.p_num = multiprocessing.cpu_count()
         # For single-core machines, or single-process MPI runs